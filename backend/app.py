@@ -11,7 +11,6 @@ from config import config
 from extensions import init_extensions, socketio
 from routes import register_blueprints
 from services import init_services
-from websocket import register_handlers
 
 
 def create_app(config_name=None):
@@ -32,7 +31,7 @@ def create_app(config_name=None):
     config_class = config.get(config_name, config['default'])
     
     # Determine static folder
-    static_folder = str(config_class.STATIC_FOLDER) if config_class.STATIC_FOLDER.exists() else '.'
+    static_folder = config_class.get_static_folder()
     
     # Create Flask app
     app = Flask(
@@ -56,7 +55,16 @@ def create_app(config_name=None):
     # Register blueprints
     register_blueprints(app)
     
-    # Register WebSocket handlers
+    # Register WebSocket handlers (imported here to keep module import light)
+    from websocket import register_handlers
     register_handlers(socketio, app)
     
+    # Probe Flutter/package versions in the background, off the request path
+    if app.config.get('REFRESH_SYSTEM_INFO'):
+        from routes.main import start_system_info_refresh
+        start_system_info_refresh()
+    
+    # Compile the URL map now rather than on the first request
+    app.url_map.update()
+    
     return app
@@ -18,9 +18,11 @@ class Config:
     DATA_DIR = BASE_DIR / "data"
     PROJECTS_DIR = DATA_DIR / "projects"
     BUILD_OUTPUT_DIR = DATA_DIR / "builds"
+    BUILD_LOGS_DIR = DATA_DIR / "build_logs"
     
     # React build directory for static files
     STATIC_FOLDER = APP_BUILDER_DIR / "frontend" / "dist"
+    _static_folder = None  # Resolved static folder string (see get_static_folder)
     
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -28,16 +30,53 @@ class Config:
     # CORS settings
     CORS_ORIGINS = "*"
     
-    # SocketIO settings
-    SOCKETIO_ASYNC_MODE = 'threading'
+    # SocketIO settings ('threading', or 'eventlet'/'gevent' if installed)
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+    
+    # Stream flutter command output to clients as it is produced; when off,
+    # it is still kept in the build logs (GET /api/build/<id>/logs)
+    STREAM_BUILD_OUTPUT = os.environ.get('STREAM_BUILD_OUTPUT', 'true').lower() != 'false'
+    
+    # Log entries kept per Flutter run (older entries are dropped)
+    RUN_LOG_MAX_ENTRIES = int(os.environ.get('RUN_LOG_MAX_ENTRIES', 5000))
+    
+    # Seconds a stopped build gets to exit after SIGINT, then after SIGTERM,
+    # before it is killed (see BuildService.stop_build)
+    BUILD_STOP_SIGINT_TIMEOUT = 3
+    BUILD_STOP_SIGTERM_TIMEOUT = 5
+    
+    # Keep /api/system-info warm with a background refresh task
+    REFRESH_SYSTEM_INFO = True
+    
+    # Let a fronting web server (nginx, Apache) send build downloads via X-Sendfile
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() == 'true'
+    
+    # Response compression settings (see extensions.init_compression)
+    COMPRESS_MIN_SIZE = 512
+    COMPRESS_LEVEL = 6
+    
+    _dirs_made = False  # Set once the data directories have been created
+    
+    @classmethod
+    def get_static_folder(cls):
+        """
+        Get the static folder to serve, falling back to '.' if the frontend
+        has not been built. The check is done once per config class.
+        """
+        if cls._static_folder is None:
+            cls._static_folder = str(cls.STATIC_FOLDER) if cls.STATIC_FOLDER.exists() else '.'
+        return cls._static_folder
     
     @classmethod
     def init_app(cls, app):
         """Initialize application with this config."""
-        # Ensure required directories exist
-        cls.DATA_DIR.mkdir(exist_ok=True)
-        cls.PROJECTS_DIR.mkdir(exist_ok=True)
-        cls.BUILD_OUTPUT_DIR.mkdir(exist_ok=True)
+        # Ensure required directories exist (once per process)
+        if not cls._dirs_made:
+            cls.DATA_DIR.mkdir(exist_ok=True)
+            cls.PROJECTS_DIR.mkdir(exist_ok=True)
+            cls.BUILD_OUTPUT_DIR.mkdir(exist_ok=True)
+            cls.BUILD_LOGS_DIR.mkdir(exist_ok=True)
+            cls._dirs_made = True
 
 
 class DevelopmentConfig(Config):
@@ -68,6 +107,7 @@ class TestingConfig(Config):
     """Testing configuration."""
     
     TESTING = True
+    REFRESH_SYSTEM_INFO = False
     
 
 # Configuration dictionary
@@ -3,22 +3,144 @@ Flask extensions initialization.
 
 Extensions are instantiated here without binding to an app,
 then initialized with the app in the factory function.
+
+Flask-CORS and Flask-SocketIO (which pulls in python-socketio and
+engineio) are imported lazily, on first use of the module-level proxies,
+so importing this module stays cheap for code that never touches them.
 """
 
-from flask_cors import CORS
-from flask_socketio import SocketIO
+import gzip
+
+import orjson
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+
+class _LazyExtension:
+    """Proxy that imports and constructs an extension on first attribute access."""
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+    
+    def _get_instance(self):
+        if self._instance is None:
+            self._instance = self._factory()
+        return self._instance
+    
+    def __getattr__(self, name):
+        return getattr(self._get_instance(), name)
+
+
+def _create_cors():
+    from flask_cors import CORS
+    return CORS()
+
+
+def _create_socketio():
+    from flask_socketio import SocketIO
+    return SocketIO()
+
 
 # Initialize extensions without app binding
-cors = CORS()
-socketio = SocketIO()
+cors = _LazyExtension(_create_cors)
+socketio = _LazyExtension(_create_socketio)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for request parsing and jsonify."""
+    
+    def _dump_bytes(self, obj, indent=False, option=0):
+        """Serialize obj to UTF-8 JSON bytes."""
+        option |= orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string, honoring an indent request."""
+        return self._dump_bytes(obj, indent=kwargs.get('indent')).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a str or bytes payload."""
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """
+        Build a JSON response directly from orjson's bytes output, skipping
+        the intermediate str and the re-encode to UTF-8.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._dump_bytes(obj, indent=indent, option=orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class OrjsonSocketIOJSON:
+    """
+    orjson-backed json module for python-socketio packet encoding, which
+    calls dumps/loads with stdlib-style keyword arguments and expects str.
+    """
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
+def init_compression(app):
+    """
+    Gzip-compress JSON responses for clients that accept it.
+    
+    Streamed and file responses are left alone, as are bodies smaller
+    than COMPRESS_MIN_SIZE where the gzip overhead isn't worth it.
+    """
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 512)
+    level = app.config.get('COMPRESS_LEVEL', 6)
+    
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        if not request.accept_encodings.quality('gzip'):
+            return response
+        
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        
+        response.set_data(gzip.compress(data, compresslevel=level))
+        response.headers['Content-Encoding'] = 'gzip'
+        
+        # The compressed body is no longer byte-identical to what a strong
+        # ETag was computed over
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        
+        return response
 
 
 def init_extensions(app):
     """Initialize all Flask extensions with the app instance."""
+    app.json = OrjsonProvider(app)
+    init_compression(app)
     cors.init_app(app)
     socketio.init_app(
         app,
         cors_allowed_origins=app.config.get('CORS_ORIGINS', '*'),
-        async_mode=app.config.get('SOCKETIO_ASYNC_MODE', 'threading')
+        async_mode=app.config.get('SOCKETIO_ASYNC_MODE', 'threading'),
+        json=OrjsonSocketIOJSON
     )
 
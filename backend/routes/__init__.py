@@ -1,27 +1,37 @@
 """
 Routes package - API endpoint blueprints.
 
-Each blueprint defines routes for a specific domain.
+Each blueprint defines routes for a specific domain. Blueprints are
+referenced by module path and only imported when registered, so importing
+this package does not pull in every route module and its services.
 """
 
-from .projects import bp as projects_bp
-from .apps import bp as apps_bp
-from .build import bp as build_bp
-from .flutter import bp as flutter_bp
-from .browse import bp as browse_bp
-from .main import bp as main_bp
-from .steps import bp as steps_bp
+import importlib
 
+# (module path relative to this package, blueprint attribute, URL prefix)
+BLUEPRINTS = [
+    ('.main', 'bp', None),
+    ('.projects', 'bp', '/api/projects'),
+    ('.apps', 'bp', '/api/apps'),
+    ('.build', 'bp', '/api/build'),
+    ('.flutter', 'bp', '/api/flutter'),
+    ('.browse', 'bp', '/api/browse'),
+    ('.steps', 'bp', '/api/steps'),
+]
 
-def register_blueprints(app):
-    """Register all blueprints with the Flask app."""
-    app.register_blueprint(main_bp)
-    app.register_blueprint(projects_bp, url_prefix='/api/projects')
-    app.register_blueprint(apps_bp, url_prefix='/api/apps')
-    app.register_blueprint(build_bp, url_prefix='/api/build')
-    app.register_blueprint(flutter_bp, url_prefix='/api/flutter')
-    app.register_blueprint(browse_bp, url_prefix='/api/browse')
-    app.register_blueprint(steps_bp, url_prefix='/api/steps')
 
+def register_blueprints(app, blueprints=None):
+    """
+    Register blueprints with the Flask app.
 
-__all__ = ['register_blueprints']
+    Args:
+        app: Flask application instance
+        blueprints: Optional list of (module_path, attr, url_prefix) specs.
+                    Defaults to BLUEPRINTS (all blueprints).
+    """
+    for module_path, attr, url_prefix in blueprints or BLUEPRINTS:
+        module = importlib.import_module(module_path, __name__)
+        app.register_blueprint(getattr(module, attr), url_prefix=url_prefix)
+
+
+__all__ = ['BLUEPRINTS', 'register_blueprints']
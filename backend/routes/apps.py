@@ -2,13 +2,44 @@
 App API endpoints.
 """
 
-import json
+import os
+
+import orjson
 from flask import Blueprint, request, jsonify
 
 from services import get_app_service
 
 bp = Blueprint('apps', __name__)
 
+# Plain-text and JSON-encoded fields accepted in legacy FormData app payloads
+_FORM_TEXT_FIELDS = ('appName', 'packageId', 'logoUrl')
+_FORM_JSON_FIELDS = ('platforms', 'buildSettings')
+
+
+def _parse_app_form(form):
+    """
+    Parse legacy FormData app fields into a dict.
+    
+    Only non-empty fields are included. Text fields are stripped, and
+    JSON-encoded fields that fail to parse are skipped.
+    """
+    app_data = {}
+    
+    for key in _FORM_TEXT_FIELDS:
+        value = form.get(key)
+        if value:
+            app_data[key] = value.strip()
+    
+    for key in _FORM_JSON_FIELDS:
+        value = form.get(key)
+        if value:
+            try:
+                app_data[key] = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                pass
+    
+    return app_data
+
 
 @bp.route('', methods=['GET'])
 def get_all():
@@ -24,38 +55,26 @@ def create():
     try:
         service = get_app_service()
         
-        # Handle JSON request
-        if request.content_type and 'application/json' in request.content_type:
-            data = request.json
-            app_name = data.get('appName', '').strip()
-            package_id = data.get('packageId', '').strip()
+        # Handle JSON request, falling back to legacy FormData
+        is_json = request.is_json
+        data = (request.get_json(silent=True) or {}) if is_json else request.form
+        
+        # Validate required fields before parsing anything else
+        app_name = (data.get('appName') or '').strip()
+        package_id = (data.get('packageId') or '').strip()
+        
+        if not app_name or not package_id:
+            return jsonify({'error': 'App name and package ID are required'}), 400
+        
+        if is_json:
             platforms = data.get('platforms', ['android'])
             logo_url = data.get('logoUrl', '').strip() if data.get('logoUrl') else None
             build_settings = data.get('buildSettings')
         else:
-            # Legacy FormData support
-            app_name = request.form.get('appName', '').strip()
-            package_id = request.form.get('packageId', '').strip()
-            platforms_json = request.form.get('platforms', '["android"]')
-            logo_url = request.form.get('logoUrl', '').strip() or None
-            
-            try:
-                platforms = json.loads(platforms_json)
-                if not platforms:
-                    platforms = ['android']
-            except json.JSONDecodeError:
-                platforms = ['android']
-            
-            build_settings_json = request.form.get('buildSettings')
-            build_settings = None
-            if build_settings_json:
-                try:
-                    build_settings = json.loads(build_settings_json)
-                except json.JSONDecodeError:
-                    pass
-        
-        if not app_name or not package_id:
-            return jsonify({'error': 'App name and package ID are required'}), 400
+            form_data = _parse_app_form(request.form)
+            platforms = form_data.get('platforms') or ['android']
+            logo_url = form_data.get('logoUrl') or None
+            build_settings = form_data.get('buildSettings')
         
         app_data = {
             'appName': app_name,
@@ -69,7 +88,7 @@ def create():
         if build_settings:
             app_data['buildSettings'] = build_settings
         
-        app_id = service.add(app_data)
+        app_id, _ = service.add(app_data)
         
         return jsonify({'id': app_id, 'message': 'App added successfully'}), 201
         
@@ -96,32 +115,11 @@ def update(app_id):
         service = get_app_service()
         
         # Handle JSON request
-        if request.content_type and 'application/json' in request.content_type:
+        if request.is_json:
             app_data = request.json
         else:
             # Legacy FormData support
-            app_data = {}
-            
-            if request.form.get('appName'):
-                app_data['appName'] = request.form.get('appName', '').strip()
-            if request.form.get('packageId'):
-                app_data['packageId'] = request.form.get('packageId', '').strip()
-            if request.form.get('logoUrl'):
-                app_data['logoUrl'] = request.form.get('logoUrl', '').strip()
-            
-            platforms_str = request.form.get('platforms')
-            if platforms_str:
-                try:
-                    app_data['platforms'] = json.loads(platforms_str)
-                except json.JSONDecodeError:
-                    pass
-            
-            build_settings_str = request.form.get('buildSettings')
-            if build_settings_str:
-                try:
-                    app_data['buildSettings'] = json.loads(build_settings_str)
-                except json.JSONDecodeError:
-                    pass
+            app_data = _parse_app_form(request.form)
         
         if not service.update(app_id, app_data):
             return jsonify({"error": "App not found"}), 404
@@ -147,16 +145,17 @@ def check_assets(app_id):
         service = get_app_service()
         app_dir = service.get_app_dir(app_id)
         
-        if not app_dir or not app_dir.exists():
+        if not app_dir or not os.path.exists(app_dir):
             return jsonify({"error": "App not found"}), 404
         
-        # Check for res.zip (still used by Android Setup step)
-        res_zip_path = app_dir / "android" / "app_icon" / "res.zip"
-        has_res_zip = res_zip_path.exists()
+        # Check for res.zip (still used by Android Setup step); plain string
+        # paths keep this stat-only endpoint cheap
+        res_zip_path = os.path.join(app_dir, 'android', 'app_icon', 'res.zip')
+        has_res_zip = os.path.exists(res_zip_path)
         
         return jsonify({
             "hasResZip": has_res_zip,
-            "resZipPath": str(res_zip_path) if has_res_zip else None
+            "resZipPath": res_zip_path if has_res_zip else None
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -180,10 +179,7 @@ def upload_assets(app_id):
             if file.filename:
                 # Handle res.zip for Android app icons
                 if file.filename.lower().endswith('.zip') and 'res' in file.filename.lower():
-                    upload_dir = app_dir / "android" / "app_icon"
-                    upload_dir.mkdir(parents=True, exist_ok=True)
-                    file_path = upload_dir / "res.zip"
-                    file.save(file_path)
+                    file_path = service.save_res_zip(app_dir, file)
                     uploaded_files.append(str(file_path))
         
         return jsonify({
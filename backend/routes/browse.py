@@ -3,28 +3,38 @@ Directory browser API endpoint.
 """
 
 import os
+import stat
+import time
 from pathlib import Path
 from flask import Blueprint, request, jsonify
 
 bp = Blueprint('browse', __name__)
 
+# User's home directory (resolved once; it doesn't change at runtime)
+HOME_DIR = Path.home().resolve()
+
 # Allowed root directories for browsing (security)
-ALLOWED_ROOTS = [
-    Path.home(),  # User's home directory
+ALLOWED_ROOTS = (
+    HOME_DIR,     # User's home directory
     Path('/'),    # Allow root for absolute paths (with restrictions)
-]
+)
 
 # Directories to hide from listing
-HIDDEN_DIRS = {
+HIDDEN_DIRS = frozenset({
     '.git', '.svn', '.hg', '__pycache__', 'node_modules',
     '.idea', '.vscode', '.cache', '.npm', '.yarn',
-}
+})
 
-# System directories to block
-BLOCKED_DIRS = {
+# System directory prefixes to block (a tuple so str.startswith checks them all at once)
+BLOCKED_PREFIXES = tuple(sorted({
     '/bin', '/sbin', '/usr/bin', '/usr/sbin', '/etc',
     '/var', '/tmp', '/proc', '/sys', '/dev',
-}
+}))
+
+# Short-lived cache of pubspec.yaml checks: path -> (expires_at, result)
+PUBSPEC_CACHE_TTL = 2.0
+PUBSPEC_CACHE_MAX_SIZE = 4096
+_pubspec_cache = {}
 
 
 def is_path_allowed(path: Path) -> bool:
@@ -32,26 +42,36 @@ def is_path_allowed(path: Path) -> bool:
     resolved = path.resolve()
     
     # Block system directories
-    path_str = str(resolved)
-    for blocked in BLOCKED_DIRS:
-        if path_str.startswith(blocked):
-            return False
+    if str(resolved).startswith(BLOCKED_PREFIXES):
+        return False
     
     # Must be under an allowed root
-    for root in ALLOWED_ROOTS:
-        try:
-            resolved.relative_to(root)
-            return True
-        except ValueError:
-            continue
-    
-    return False
+    return any(resolved.is_relative_to(root) for root in ALLOWED_ROOTS)
 
 
-def is_flutter_project(path: Path) -> bool:
-    """Check if the path contains a Flutter project."""
-    pubspec = path / 'pubspec.yaml'
-    return pubspec.exists() and pubspec.is_file()
+def is_flutter_project(path) -> bool:
+    """
+    Check if the path contains a Flutter project.
+    
+    Results are cached for a couple of seconds, since the browser UI
+    tends to re-list the same directories repeatedly.
+    """
+    key = str(path)
+    now = time.monotonic()
+    
+    cached = _pubspec_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    try:
+        result = stat.S_ISREG(os.stat(os.path.join(key, 'pubspec.yaml')).st_mode)
+    except OSError:
+        result = False
+    
+    if len(_pubspec_cache) >= PUBSPEC_CACHE_MAX_SIZE:
+        _pubspec_cache.clear()
+    _pubspec_cache[key] = (now + PUBSPEC_CACHE_TTL, result)
+    return result
 
 
 @bp.route('', methods=['GET'])
@@ -74,7 +94,7 @@ def browse_directory():
     """
     try:
         # Get requested path, default to home directory
-        requested_path = request.args.get('path', str(Path.home()))
+        requested_path = request.args.get('path', str(HOME_DIR))
         current_path = Path(requested_path).resolve()
         
         # Security check
@@ -90,40 +110,43 @@ def browse_directory():
         
         # Get parent path
         parent_path = None
-        if current_path != Path.home() and current_path.parent != current_path:
+        if current_path != HOME_DIR and current_path.parent != current_path:
             parent = current_path.parent
             if is_path_allowed(parent):
                 parent_path = str(parent)
         
-        # List subdirectories
-        directories = []
+        # List subdirectories, skipping hidden/blocked names and
+        # directories we can't list
         try:
-            for item in sorted(current_path.iterdir()):
-                # Skip hidden files and blocked directories
-                if item.name.startswith('.') or item.name in HIDDEN_DIRS:
-                    continue
-                
-                if item.is_dir():
-                    try:
-                        # Check if accessible
-                        list(item.iterdir())
-                        directories.append({
-                            "name": item.name,
-                            "path": str(item),
-                            "is_flutter_project": is_flutter_project(item)
-                        })
-                    except PermissionError:
-                        # Skip directories we can't access
-                        continue
+            with os.scandir(current_path) as it:
+                entries = [
+                    entry for entry in it
+                    if not (entry.name.startswith('.') or entry.name in HIDDEN_DIRS)
+                    and entry.is_dir()
+                    and os.access(entry.path, os.R_OK | os.X_OK)
+                ]
         except PermissionError:
             return jsonify({"error": "Permission denied"}), 403
         
-        return jsonify({
+        entries.sort(key=lambda entry: entry.name)
+        directories = [
+            {
+                "name": entry.name,
+                "path": entry.path,
+                "is_flutter_project": is_flutter_project(entry.path)
+            }
+            for entry in entries
+        ]
+        
+        # Tag the listing so repeat polls of an unchanged directory get a 304
+        response = jsonify({
             "current_path": str(current_path),
             "parent_path": parent_path,
             "is_flutter_project": is_flutter_project(current_path),
             "directories": directories
         })
+        response.add_etag()
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
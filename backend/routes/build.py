@@ -18,8 +18,9 @@ def build_app(app_id):
         platform = data.get('platform', 'android')
         build_type = data.get('build_type', 'release')
         output_type = data.get('output_type', 'apk')
+        force_clean = bool(data.get('force_clean', False))
         
-        result = service.build(app_id, platform, build_type, output_type)
+        result = service.build(app_id, platform, build_type, output_type, force_clean=force_clean)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -27,10 +28,11 @@ def build_app(app_id):
 
 @bp.route('/stop', methods=['POST'])
 def stop_build():
-    """Stop the current build."""
+    """Stop a running build (all running builds if no build_id is given)."""
     try:
         service = get_build_service()
-        result = service.stop_build()
+        data = request.get_json(silent=True) or {}
+        result = service.stop_build(data.get('build_id'))
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -11,11 +11,18 @@ bp = Blueprint('flutter', __name__)
 
 @bp.route('/devices', methods=['GET'])
 def get_devices():
-    """Get list of available Flutter devices."""
+    """
+    Get list of available Flutter devices.
+    
+    Query Parameters:
+        project_id: Only list devices for the project's platforms
+        refresh: If 'true', fetch a new device listing instead of the cached one
+    """
     try:
         service = get_flutter_run_service()
         project_id = request.args.get('project_id')
-        devices = service.get_devices(project_id)
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        devices = service.get_devices(project_id, refresh=refresh)
         return jsonify(devices)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -31,6 +38,7 @@ def start_run():
         project_id = data.get('project_id')
         app_id = data.get('app_id')  # Optional: for run settings
         run_mode = data.get('run_mode', 'debug')  # debug, profile, or release
+        device_platform = data.get('device_platform')  # Optional: from the device listing
         
         if not device_id:
             return jsonify({"error": "Device ID is required"}), 400
@@ -42,7 +50,7 @@ def start_run():
         if run_mode not in ('debug', 'profile', 'release'):
             run_mode = 'debug'
         
-        result = service.start(device_id, project_id, app_id, run_mode)
+        result = service.start(device_id, project_id, app_id, run_mode, device_platform)
         return jsonify(result)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -3,18 +3,34 @@ Main routes - Static file serving, downloads, and system info.
 """
 
 import platform
-import subprocess
-from importlib.metadata import version as pkg_version
+import threading
+import time
+from functools import lru_cache
 
 import flask
 
 from flask import Blueprint, current_app, send_file, jsonify
 
+from extensions import socketio
+
 bp = Blueprint('main', __name__)
 
 # App version - update this when releasing new versions
 APP_VERSION = "1.0.0"
 
+# How long a `flutter --version` result is reused (seconds)
+FLUTTER_VERSION_TTL = 600
+
+# Held while a `flutter --version` probe runs; callers arriving meanwhile
+# share its result instead of starting another flutter process
+_flutter_version_lock = threading.Lock()
+_flutter_version_last = None
+_flutter_version_expires = 0.0
+_refresh_started = False
+
+# (Flutter info, serialized /api/system-info body built from it)
+_system_info_response = (None, None)
+
 
 @bp.route('/')
 @bp.route('/app/<path:path>')
@@ -31,15 +47,57 @@ def index(path=None):
 
 @bp.route('/api/download/<filename>')
 def download_file(filename):
-    """Download built APK/output file."""
+    """
+    Download built APK/output file.
+    
+    Responses carry an ETag and Last-Modified and honour conditional and
+    Range requests, so re-downloads can get a 304 and interrupted
+    downloads can resume. With USE_X_SENDFILE enabled, the file is handed
+    to the fronting web server instead of being streamed through Python.
+    """
     output_path = current_app.config['BUILD_OUTPUT_DIR'] / filename
-    if output_path.exists():
-        return send_file(output_path, as_attachment=True)
+    if output_path.is_file():
+        return send_file(output_path, as_attachment=True, conditional=True, etag=True)
     return jsonify({"error": "File not found"}), 404
 
 
-def _get_flutter_version():
-    """Get Flutter version information by running flutter --version."""
+def _get_flutter_version(force=False):
+    """
+    Get Flutter version information by running flutter --version.
+    
+    The result is cached for FLUTTER_VERSION_TTL seconds, since the SDK
+    version rarely changes while the server is running. Only one probe
+    runs at a time; concurrent callers wait for it and reuse its result
+    rather than each starting their own flutter process (which would
+    contend on the SDK's own startup lock anyway).
+    
+    Args:
+        force: Re-run the probe even if the cached result hasn't expired
+    """
+    global _flutter_version_last, _flutter_version_expires
+    
+    if not force and time.monotonic() < _flutter_version_expires:
+        return _flutter_version_last
+    
+    if not _flutter_version_lock.acquire(blocking=False):
+        # A probe is already running; wait for it and share its result
+        with _flutter_version_lock:
+            return _flutter_version_last
+    
+    try:
+        # Another thread may have refreshed the cache since the check above
+        if force or time.monotonic() >= _flutter_version_expires:
+            _flutter_version_last = _run_flutter_version()
+            _flutter_version_expires = time.monotonic() + FLUTTER_VERSION_TTL
+        return _flutter_version_last
+    finally:
+        _flutter_version_lock.release()
+
+
+def _run_flutter_version():
+    """Run flutter --version and parse its output."""
+    import subprocess  # only needed for the (cached) version probe
+    
     try:
         result = subprocess.run(
             ["flutter", "--version"],
@@ -82,23 +140,49 @@ def _get_flutter_version():
     return None
 
 
+@lru_cache(maxsize=32)
 def _get_package_version(package_name):
-    """Safely get package version."""
+    """Safely get package version (cached; installed packages don't change at runtime)."""
+    from importlib.metadata import version as pkg_version
+    
     try:
         return pkg_version(package_name)
     except Exception:
         return "unknown"
 
 
-@bp.route('/api/system-info', methods=['GET'])
-def get_system_info():
+def start_system_info_refresh():
     """
-    Get system and version information.
+    Start a background task that keeps the system info cache warm.
     
-    Returns app version, backend framework versions, Flutter version,
-    and system information.
+    The task builds the static system info and re-probes the Flutter
+    version every half FLUTTER_VERSION_TTL, so /api/system-info is served
+    from cache instead of waiting on `flutter --version`. Calling this
+    more than once has no effect.
+    """
+    global _refresh_started
+    
+    if _refresh_started:
+        return
+    _refresh_started = True
+    socketio.start_background_task(_refresh_system_info)
+
+
+def _refresh_system_info():
+    """Background loop behind start_system_info_refresh."""
+    _get_static_system_info()
+    while True:
+        _get_flutter_version(force=True)
+        socketio.sleep(FLUTTER_VERSION_TTL / 2)
+
+
+@lru_cache(maxsize=None)
+def _get_static_system_info():
     """
-    return jsonify({
+    Get the parts of the system info that can't change while the server
+    is running (interpreter, package and OS details). Built once.
+    """
+    return {
         "app_version": APP_VERSION,
         "backend": {
             "python": platform.python_version(),
@@ -111,5 +195,27 @@ def get_system_info():
             "architecture": platform.machine(),
             "hostname": platform.node(),
         },
-        "flutter": _get_flutter_version(),
-    })
+    }
+
+
+@bp.route('/api/system-info', methods=['GET'])
+def get_system_info():
+    """
+    Get system and version information.
+    
+    Returns app version, backend framework versions, Flutter version,
+    and system information. The serialized body is reused until the
+    cached Flutter version is refreshed.
+    """
+    global _system_info_response
+    
+    flutter_info = _get_flutter_version()
+    cached_flutter, body = _system_info_response
+    if body is None or flutter_info is not cached_flutter:
+        body = current_app.json.dumps({
+            **_get_static_system_info(),
+            "flutter": flutter_info,
+        })
+        _system_info_response = (flutter_info, body)
+    
+    return current_app.response_class(body, mimetype='application/json')
@@ -2,13 +2,18 @@
 Project API endpoints.
 """
 
-from pathlib import Path
-from flask import Blueprint, request, jsonify
+import os
+
+import orjson
+from flask import Blueprint, Response, request, jsonify
 
 from services import get_project_service, get_app_service, get_build_history_service
 
 bp = Blueprint('projects', __name__)
 
+# Platform directories a Flutter project may contain, in display order
+PLATFORM_DIRS = ('android', 'ios', 'web', 'macos', 'windows', 'linux')
+
 
 @bp.route('', methods=['GET'])
 def get_projects():
@@ -25,8 +30,7 @@ def add_project():
         service = get_project_service()
         data = request.json or {}
         
-        project_id = service.add(data)
-        project = service.get(project_id)
+        project_id, project = service.add(data)
         
         return jsonify({
             "id": project_id,
@@ -46,8 +50,7 @@ def clone_project():
         service = get_project_service()
         data = request.json or {}
         
-        project_id = service.clone_and_add(data)
-        project = service.get(project_id)
+        project_id, project = service.clone_and_add(data)
         
         return jsonify({
             "id": project_id,
@@ -173,24 +176,14 @@ def get_project_platforms(project_id):
     if not project:
         return jsonify({"error": "Project not found"}), 404
     
-    project_path = Path(project['path'])
-    
-    # Platform directory mapping
-    platform_dirs = {
-        'android': 'android',
-        'ios': 'ios',
-        'web': 'web',
-        'macos': 'macos',
-        'windows': 'windows',
-        'linux': 'linux',
-    }
+    # Check which platform directories exist with a single directory listing
+    try:
+        with os.scandir(project['path']) as it:
+            found = {entry.name for entry in it if entry.is_dir()}
+    except OSError:
+        found = set()
     
-    # Check which platform directories exist
-    platforms = []
-    for platform, dir_name in platform_dirs.items():
-        platform_path = project_path / dir_name
-        if platform_path.exists() and platform_path.is_dir():
-            platforms.append(platform)
+    platforms = [platform for platform in PLATFORM_DIRS if platform in found]
     
     return jsonify({
         "project_id": project_id,
@@ -204,7 +197,7 @@ def get_project_apps(project_id):
     """Get all apps for a project."""
     project_service = get_project_service()
     
-    if not project_service.get(project_id):
+    if not project_service.exists(project_id):
         return jsonify({"error": "Project not found"}), 404
     
     app_service = get_app_service()
@@ -218,16 +211,15 @@ def add_project_app(project_id):
     try:
         project_service = get_project_service()
         
-        if not project_service.get(project_id):
+        if not project_service.exists(project_id):
             return jsonify({"error": "Project not found"}), 404
         
         app_service = get_app_service()
         
         # Handle both JSON and FormData
-        if request.content_type and 'application/json' in request.content_type:
+        if request.is_json:
             data = request.json or {}
         else:
-            import json
             data = {
                 'appName': request.form.get('appName', ''),
                 'packageId': request.form.get('packageId', ''),
@@ -235,8 +227,8 @@ def add_project_app(project_id):
             # Parse platforms from JSON string
             platforms_str = request.form.get('platforms', '[]')
             try:
-                data['platforms'] = json.loads(platforms_str)
-            except json.JSONDecodeError:
+                data['platforms'] = orjson.loads(platforms_str)
+            except orjson.JSONDecodeError:
                 data['platforms'] = ['android']
             
             # Handle logo URL
@@ -247,13 +239,13 @@ def add_project_app(project_id):
             build_settings_str = request.form.get('buildSettings')
             if build_settings_str:
                 try:
-                    data['buildSettings'] = json.loads(build_settings_str)
-                except json.JSONDecodeError:
+                    data['buildSettings'] = orjson.loads(build_settings_str)
+                except orjson.JSONDecodeError:
                     pass
         
         data['project_id'] = project_id
         
-        app_id = app_service.add(data)
+        app_id, _ = app_service.add(data)
         
         # Handle file uploads if present
         if 'androidAppIcon' in request.files:
@@ -262,9 +254,7 @@ def add_project_app(project_id):
                 # Save the file to the app's assets directory
                 app_dir = app_service.get_app_dir(app_id, project_id)
                 if app_dir:
-                    icon_dir = app_dir / "android" / "app_icon"
-                    icon_dir.mkdir(parents=True, exist_ok=True)
-                    file.save(icon_dir / "res.zip")
+                    app_service.save_res_zip(app_dir, file)
         
         return jsonify({
             "id": app_id,
@@ -279,10 +269,16 @@ def add_project_app(project_id):
 # Build history routes
 @bp.route('/<project_id>/apps/<app_id>/builds', methods=['GET'])
 def get_build_history(project_id, app_id):
-    """Get build history for an app."""
+    """
+    Get build history for an app.
+    
+    Clients that send `Accept: application/x-ndjson` get the records
+    streamed as newline-delimited JSON, one record per line, so they can
+    render rows as they arrive; otherwise a JSON array is returned.
+    """
     project_service = get_project_service()
     
-    if not project_service.get(project_id):
+    if not project_service.exists(project_id):
         return jsonify({"error": "Project not found"}), 404
     
     app_service = get_app_service()
@@ -295,6 +291,13 @@ def get_build_history(project_id, app_id):
     history_service = get_build_history_service()
     history = history_service.get_history(project_id, app_id, limit=limit)
     
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    if best == 'application/x-ndjson':
+        return Response(
+            (orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in history),
+            mimetype='application/x-ndjson'
+        )
+    
     return jsonify(history)
 
 
@@ -303,7 +306,7 @@ def delete_build(project_id, app_id, build_id):
     """Delete a build record and its output file."""
     project_service = get_project_service()
     
-    if not project_service.get(project_id):
+    if not project_service.exists(project_id):
         return jsonify({"error": "Project not found"}), 404
     
     app_service = get_app_service()
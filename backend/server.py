@@ -5,9 +5,24 @@ AppStream Server - Entry point.
 Usage:
     python server.py                    # Development mode
     FLASK_ENV=production python server.py  # Production mode
+
+    # Serve with eventlet or gevent instead of the threaded Werkzeug server
+    # (requires `pip install eventlet` / `pip install gevent`)
+    SOCKETIO_ASYNC_MODE=eventlet FLASK_ENV=production python server.py
 """
 
 import os
+
+# eventlet/gevent must patch the standard library before anything else
+# (sockets, threads, subprocess) is imported
+ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
 from app import create_app
 from extensions import socketio
 
@@ -24,6 +39,7 @@ if __name__ == '__main__':
     print(f"Starting AppStream Server...")
     print(f"Environment: {os.environ.get('FLASK_ENV', 'development')}")
     print(f"Debug: {debug}")
+    print(f"Async Mode: {ASYNC_MODE}")
     print(f"Project Root: {app.config['PROJECT_ROOT']}")
     print(f"Projects Directory: {app.config['PROJECTS_DIR']}")
     print(f"Build Output Directory: {app.config['BUILD_OUTPUT_DIR']}")
@@ -34,5 +50,6 @@ if __name__ == '__main__':
         debug=debug,
         host=host,
         port=port,
+        # Only consulted when falling back to the Werkzeug server (threading mode)
         allow_unsafe_werkzeug=True
     )
@@ -1,8 +1,9 @@
 """
 Services package - Business logic layer.
 
-Services are instantiated and stored on the app context
-for access via current_app throughout the application.
+Services are instantiated once in init_services and stored on the app
+context (app.extensions). The get_*_service accessors return module-level
+references bound at that point, so they assume one app per process.
 """
 
 from .project_service import ProjectService
@@ -21,9 +22,20 @@ __all__ = [
     'WorkflowExecutor',
 ]
 
+# Service singletons, bound by init_services
+_project_service = None
+_app_service = None
+_build_service = None
+_flutter_run_service = None
+_build_history_service = None
+_workflow_executor = None
+
 
 def init_services(app):
     """Initialize services and store on app context."""
+    global _project_service, _app_service, _build_service
+    global _flutter_run_service, _build_history_service, _workflow_executor
+    
     # Store service classes on app for lazy instantiation
     app.project_service_class = ProjectService
     app.app_service_class = AppService
@@ -32,46 +44,48 @@ def init_services(app):
     app.build_history_service_class = BuildHistoryService
     app.workflow_executor_class = WorkflowExecutor
     
+    # Create singleton instances
+    _project_service = ProjectService(app)
+    _app_service = AppService(app)
+    _build_service = BuildService(app)
+    _flutter_run_service = FlutterRunService(app)
+    _build_history_service = BuildHistoryService(app)
+    _workflow_executor = WorkflowExecutor(app)
+    
     # Store singleton instances
-    app.extensions['project_service'] = ProjectService(app)
-    app.extensions['app_service'] = AppService(app)
-    app.extensions['build_service'] = BuildService(app)
-    app.extensions['flutter_run_service'] = FlutterRunService(app)
-    app.extensions['build_history_service'] = BuildHistoryService(app)
-    app.extensions['workflow_executor'] = WorkflowExecutor(app)
+    app.extensions['project_service'] = _project_service
+    app.extensions['app_service'] = _app_service
+    app.extensions['build_service'] = _build_service
+    app.extensions['flutter_run_service'] = _flutter_run_service
+    app.extensions['build_history_service'] = _build_history_service
+    app.extensions['workflow_executor'] = _workflow_executor
 
 
 def get_project_service():
-    """Get the project service from current app context."""
-    from flask import current_app
-    return current_app.extensions['project_service']
+    """Get the project service."""
+    return _project_service
 
 
 def get_app_service():
-    """Get the app service from current app context."""
-    from flask import current_app
-    return current_app.extensions['app_service']
+    """Get the app service."""
+    return _app_service
 
 
 def get_build_service():
-    """Get the build service from current app context."""
-    from flask import current_app
-    return current_app.extensions['build_service']
+    """Get the build service."""
+    return _build_service
 
 
 def get_flutter_run_service():
-    """Get the flutter run service from current app context."""
-    from flask import current_app
-    return current_app.extensions['flutter_run_service']
+    """Get the flutter run service."""
+    return _flutter_run_service
 
 
 def get_build_history_service():
-    """Get the build history service from current app context."""
-    from flask import current_app
-    return current_app.extensions['build_history_service']
+    """Get the build history service."""
+    return _build_history_service
 
 
 def get_workflow_executor():
-    """Get the workflow executor from current app context."""
-    from flask import current_app
-    return current_app.extensions['workflow_executor']
+    """Get the workflow executor."""
+    return _workflow_executor
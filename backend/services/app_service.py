@@ -2,11 +2,17 @@
 AppService - Handles app CRUD operations scoped by project.
 """
 
-import json
-import shutil
-import uuid
+import os
+import secrets
 from datetime import datetime
 
+import orjson
+
+from .storage import ensure_dir, forget_dir, write_atomic
+
+# Buffer size for streaming uploaded files to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class AppService:
     """Service for managing app data scoped to projects."""
@@ -14,6 +20,7 @@ class AppService:
     def __init__(self, app=None):
         self.flask_app = app
         self._apps_cache = {}  # Cache apps per project
+        self._path_cache = {}  # project_id -> (apps_dir, apps_file)
         
         if app is not None:
             self.init_app(app)
@@ -23,30 +30,33 @@ class AppService:
         self.flask_app = app
         self._projects_dir = app.config['PROJECTS_DIR']
     
+    def _paths(self, project_id):
+        """Get the (apps directory, apps.json file) paths for a project, built once."""
+        paths = self._path_cache.get(project_id)
+        if paths is None:
+            apps_dir = self._projects_dir / project_id / "apps"
+            paths = self._path_cache[project_id] = (apps_dir, apps_dir / "apps.json")
+        return paths
+    
     def _get_apps_file(self, project_id):
         """Get the apps.json file path for a project."""
-        return self._projects_dir / project_id / "apps" / "apps.json"
+        return self._paths(project_id)[1]
     
     def _get_apps_dir(self, project_id):
         """Get the apps directory for a project."""
-        return self._projects_dir / project_id / "apps"
+        return self._paths(project_id)[0]
     
     def _load_apps(self, project_id):
         """Load apps for a specific project."""
-        apps_file = self._get_apps_file(project_id)
-        
-        if apps_file.exists():
-            with open(apps_file, 'r') as f:
-                return json.load(f)
-        return {}
+        try:
+            return orjson.loads(self._get_apps_file(project_id).read_bytes())
+        except FileNotFoundError:
+            return {}
     
     def _save_apps(self, project_id, apps):
         """Save apps for a specific project."""
         apps_file = self._get_apps_file(project_id)
-        apps_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(apps_file, 'w') as f:
-            json.dump(apps, f, indent=2)
+        write_atomic(apps_file, orjson.dumps(apps, option=orjson.OPT_INDENT_2))
         
         # Update cache
         self._apps_cache[project_id] = apps
@@ -58,7 +68,12 @@ class AppService:
         return self._apps_cache[project_id]
     
     def add(self, app_data):
-        """Add a new app to a project."""
+        """
+        Add a new app to a project.
+        
+        Returns:
+            Tuple of (app_id, app dict)
+        """
         project_id = app_data.get('project_id')
         
         if not project_id:
@@ -69,14 +84,13 @@ class AppService:
         if not app_name:
             raise ValueError("App name is required")
         
-        # Generate unique ID (like project IDs)
-        app_id = uuid.uuid4().hex[:8]
-        
         apps = self._get_apps(project_id)
         
-        # Ensure unique ID (very unlikely collision, but check anyway)
+        # Generate unique 8-hex-char ID (like project IDs); collisions are
+        # very unlikely, but check anyway
+        app_id = secrets.token_hex(4)
         while app_id in apps:
-            app_id = uuid.uuid4().hex[:8]
+            app_id = secrets.token_hex(4)
         
         app_data['id'] = app_id
         app_data['project_id'] = project_id
@@ -88,12 +102,12 @@ class AppService:
         # Create app directory for assets
         app_dir = self._get_apps_dir(project_id) / app_id
         app_dir.mkdir(exist_ok=True)
-        (app_dir / "android" / "app_icon").mkdir(parents=True, exist_ok=True)
+        ensure_dir(app_dir / "android" / "app_icon")
         
         apps[app_id] = app_data
         self._save_apps(project_id, apps)
         
-        return app_id
+        return app_id, app_data
     
     def get(self, app_id, project_id=None):
         """Get app by ID. If project_id not provided, search all projects."""
@@ -101,8 +115,17 @@ class AppService:
             apps = self._get_apps(project_id)
             return apps.get(app_id)
         
-        # Search all projects
+        # Check projects whose apps are already loaded first, so lookups of
+        # known apps don't have to rescan the projects directory (the
+        # isdir check skips projects deleted since they were cached)
+        for pid, apps in list(self._apps_cache.items()):
+            if app_id in apps and os.path.isdir(self._get_apps_dir(pid)):
+                return apps[app_id]
+        
+        # Search the remaining projects on disk
         for pid in self._get_all_project_ids():
+            if pid in self._apps_cache:
+                continue
             apps = self._get_apps(pid)
             if app_id in apps:
                 return apps[app_id]
@@ -110,9 +133,15 @@ class AppService:
     
     def _get_all_project_ids(self):
         """Get all project IDs from the projects directory."""
-        if not self._projects_dir.exists():
+        try:
+            with os.scandir(self._projects_dir) as it:
+                return [
+                    entry.name for entry in it
+                    if entry.is_dir(follow_symlinks=False)
+                    and os.path.isdir(os.path.join(entry.path, "apps"))
+                ]
+        except FileNotFoundError:
             return []
-        return [d.name for d in self._projects_dir.iterdir() if d.is_dir() and (d / "apps").exists()]
     
     def get_all(self):
         """Get all apps across all projects."""
@@ -172,7 +201,9 @@ class AppService:
         
         app_dir = self._get_apps_dir(project_id) / app_id
         if app_dir.exists():
+            import shutil
             shutil.rmtree(app_dir)
+        forget_dir(app_dir / "android" / "app_icon")
         
         del apps[app_id]
         self._save_apps(project_id, apps)
@@ -189,4 +220,27 @@ class AppService:
             return None
         
         return self._get_apps_dir(project_id) / app_id
-
+    
+    def save_res_zip(self, app_dir, file):
+        """
+        Save an uploaded res.zip (Android app icons) to an app's assets directory.
+        
+        The upload is streamed to disk in large chunks rather than through
+        Werkzeug's FileStorage.save, which copies with a 16KB buffer.
+        
+        Args:
+            app_dir: The app's assets directory
+            file: Uploaded FileStorage object
+            
+        Returns:
+            Path to the saved res.zip
+        """
+        icon_dir = app_dir / "android" / "app_icon"
+        ensure_dir(icon_dir)
+        file_path = icon_dir / "res.zip"
+        
+        import shutil
+        with open(file_path, 'wb') as dst:
+            shutil.copyfileobj(file.stream, dst, UPLOAD_CHUNK_SIZE)
+        
+        return file_path
@@ -2,17 +2,26 @@
 BuildHistoryService - Stores and retrieves build history records for apps.
 """
 
-import json
 import os
+from collections import deque
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
+import orjson
+
+from .storage import write_atomic
+
+# Number of build records kept per app
+MAX_HISTORY_RECORDS = 50
+
 
 class BuildHistoryService:
     """Service for managing build history records."""
     
     def __init__(self, app=None):
         self.app = app
+        self._history_cache = {}  # (project_id, app_id) -> (mtime_ns, records)
         
         if app is not None:
             self.init_app(app)
@@ -28,21 +37,64 @@ class BuildHistoryService:
         return self._projects_dir / project_id / "apps" / app_id / "build_history.json"
     
     def _load_history(self, project_id, app_id):
-        """Load build history for an app."""
+        """
+        Load build history for an app.
+        
+        Parsed history is cached per app and reused while the file's
+        mtime is unchanged, so edits from outside this process are still
+        picked up. Returns a new deque, bounded to MAX_HISTORY_RECORDS,
+        that the caller may modify.
+        """
+        key = (project_id, app_id)
         history_file = self._get_history_file(project_id, app_id)
         
-        if history_file.exists():
-            with open(history_file, 'r') as f:
-                return json.load(f)
-        return []
+        try:
+            mtime = os.stat(history_file).st_mtime_ns
+        except OSError:
+            self._history_cache.pop(key, None)
+            return deque(maxlen=MAX_HISTORY_RECORDS)
+        
+        cached = self._history_cache.get(key)
+        if cached and cached[0] == mtime:
+            return deque(cached[1], maxlen=MAX_HISTORY_RECORDS)
+        
+        history = orjson.loads(history_file.read_bytes())
+        self._history_cache[key] = (mtime, history)
+        return deque(history, maxlen=MAX_HISTORY_RECORDS)
     
     def _save_history(self, project_id, app_id, history):
         """Save build history for an app."""
         history_file = self._get_history_file(project_id, app_id)
-        history_file.parent.mkdir(parents=True, exist_ok=True)
+        history = list(history)
+        write_atomic(history_file, orjson.dumps(history, option=orjson.OPT_INDENT_2))
         
-        with open(history_file, 'w') as f:
-            json.dump(history, f, indent=2)
+        # Update cache
+        self._history_cache[(project_id, app_id)] = (
+            os.stat(history_file).st_mtime_ns, history
+        )
+    
+    def _list_outputs(self):
+        """Get the set of file names currently in the build output directory."""
+        try:
+            with os.scandir(self._build_output_dir) as it:
+                return {entry.name for entry in it}
+        except FileNotFoundError:
+            return set()
+    
+    def _output_exists(self, record, existing=None):
+        """
+        Check whether a successful build's output file still exists.
+        
+        Args:
+            record: Build record
+            existing: Optional set of output file names (see _list_outputs)
+                      to check against instead of stat'ing the file
+        """
+        if record.get("filename") and record.get("status") == "success":
+            if existing is not None:
+                return record["filename"] in existing
+            return (self._build_output_dir / record["filename"]).exists()
+        return False
     
     def add_record(self, project_id, app_id, build_data):
         """
@@ -75,11 +127,9 @@ class BuildHistoryService:
             "duration": build_data.get("duration"),
         }
         
-        # Add to beginning of list (newest first)
-        history.insert(0, record)
-        
-        # Keep only last 50 records
-        history = history[:50]
+        # Add to the front (newest first); the bounded deque drops the
+        # oldest record once MAX_HISTORY_RECORDS is reached
+        history.appendleft(record)
         
         self._save_history(project_id, app_id, history)
         return record
@@ -96,17 +146,16 @@ class BuildHistoryService:
         Returns:
             List of build records, newest first
         """
-        history = self._load_history(project_id, app_id)
-        
-        # Check if output files still exist
-        for record in history:
-            if record.get("filename") and record.get("status") == "success":
-                output_path = self._build_output_dir / record["filename"]
-                record["file_exists"] = output_path.exists()
-            else:
-                record["file_exists"] = False
-        
-        return history[:limit]
+        history = list(islice(self._load_history(project_id, app_id), limit))
+        
+        # Check if output files still exist (on copies, so the cached
+        # records aren't modified), listing the output directory once
+        # rather than stat'ing every file
+        existing = self._list_outputs() if history else set()
+        return [
+            {**record, "file_exists": self._output_exists(record, existing)}
+            for record in history
+        ]
     
     def get_record(self, project_id, app_id, build_id):
         """Get a specific build record."""
@@ -114,12 +163,7 @@ class BuildHistoryService:
         
         for record in history:
             if record.get("build_id") == build_id:
-                if record.get("filename") and record.get("status") == "success":
-                    output_path = self._build_output_dir / record["filename"]
-                    record["file_exists"] = output_path.exists()
-                else:
-                    record["file_exists"] = False
-                return record
+                return {**record, "file_exists": self._output_exists(record)}
         
         return None
     
@@ -147,7 +191,7 @@ class BuildHistoryService:
                         output_path.unlink()
                 
                 # Remove record from history
-                history.pop(i)
+                del history[i]
                 self._save_history(project_id, app_id, history)
                 return True
         
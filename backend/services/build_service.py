@@ -5,26 +5,115 @@ This is a slim orchestrator that delegates platform-specific setup
 and build handling to the appropriate platform handlers.
 """
 
+import atexit
+import errno
+import hashlib
 import os
+import queue
+import shlex
 import shutil
+import signal
 import subprocess
+import sys
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+import orjson
+
+from extensions import socketio
 
 from .platforms import get_handler
+from .process_output import read_lines
+from .storage import write_atomic
+from .workflows.steps.custom_args_step import CustomArgsStep
 from .workflows.workflow_executor import WorkflowExecutor
 
+# Build log entries are sent to clients in batches: at most every
+# LOG_FLUSH_INTERVAL seconds, or as soon as LOG_BATCH_SIZE entries are pending
+LOG_FLUSH_INTERVAL = 0.1
+LOG_BATCH_SIZE = 64
+
+# Flutter commands get their own process group, so stopping a build also
+# reaches the Gradle/Dart processes flutter spawns
+if sys.platform == 'win32':
+    _NEW_PROCESS_GROUP = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _NEW_PROCESS_GROUP = {"start_new_session": True}
+
+# Maximum bytes read from a flutter command's output at a time
+OUTPUT_READ_SIZE = 64 * 1024
+
+# Full build logs are written to BUILD_LOGS_DIR as <build_id>.jsonl (the
+# newest MAX_BUILD_LOG_FILES are kept). In memory, only the tail of the most
+# recent MAX_BUILD_LOGS builds is kept: their last MAX_LOG_LINES_PER_BUILD
+# entries, for status polls
+MAX_BUILD_LOG_FILES = 200
+MAX_BUILD_LOGS = 50
+MAX_LOG_LINES_PER_BUILD = 500
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+
+# Project files whose changes make a build start with `flutter clean`; the
+# app's configuration is hashed along with them
+CLEAN_INPUT_FILES = (
+    'pubspec.yaml',
+    'pubspec.lock',
+    'android/build.gradle',
+    'android/build.gradle.kts',
+    'android/app/build.gradle',
+    'android/app/build.gradle.kts',
+    'ios/Podfile.lock',
+)
+
+# Characters in app names that can't appear in output filenames
+_FILENAME_UNSAFE = str.maketrans(' /\\:', '____')
+
+# Console labels for log levels
+_LEVEL_LABELS = {
+    "info": "INFO",
+    "success": "SUCCESS",
+    "warning": "WARNING",
+    "error": "ERROR",
+    "terminal": "TERMINAL",
+}
+
+
+@dataclass
+class BuildState:
+    """State of a running build."""
+    app_id: str
+    platform: str
+    started_monotonic: float  # For the build duration
+    started_wall: datetime  # For the output filename
+    process: Optional[subprocess.Popen] = None  # Flutter command currently running
+
 
 class BuildService:
     """Service for managing Flutter build operations."""
     
     def __init__(self, app=None):
         self.app = app
-        self.build_logs = {}
-        self.current_process = None
-        self.current_build_id = None
-        self._build_start_time = None
+        self.build_logs = OrderedDict()  # build_id -> deque of recent log entries, oldest build first
+        self._log_files = {}  # build_id -> open JSONL log file of a running build
+        self._builds = {}  # build_id -> BuildState of a running build
+        self._stream_build_output = True
+        self._stop_sigint_timeout = 3
+        self._stop_sigterm_timeout = 5
+        self._log_buffer = {}  # build_id -> log entries not yet emitted
+        self._log_lock = threading.Lock()
+        self._log_flusher_running = False
+        self._timestamp_cache = (None, None)  # (epoch second, ISO string)
+        self._command_cache = {}  # (handler class, build_type, output_type) -> build command
+        self._history_queue = queue.SimpleQueue()  # (project_id, app_id, record), or None to stop
+        self._history_writer = None
+        self._history_writer_lock = threading.Lock()
+        self._path_cache = {}  # project_id -> (path string, project root, apps dir)
         
         if app is not None:
             self.init_app(app)
@@ -34,10 +123,13 @@ class BuildService:
         self.app = app
         self._projects_dir = app.config['PROJECTS_DIR']
         self._build_output_dir = app.config['BUILD_OUTPUT_DIR']
+        self._build_logs_dir = app.config['BUILD_LOGS_DIR']
+        self._stream_build_output = app.config.get('STREAM_BUILD_OUTPUT', True)
+        self._stop_sigint_timeout = app.config.get('BUILD_STOP_SIGINT_TIMEOUT', 3)
+        self._stop_sigterm_timeout = app.config.get('BUILD_STOP_SIGTERM_TIMEOUT', 5)
     
     def _get_socketio(self):
         """Get socketio from extensions."""
-        from extensions import socketio
         return socketio
     
     def _get_app_service(self):
@@ -56,21 +148,36 @@ class BuildService:
         """Get workflow executor from app context."""
         return self.app.extensions['workflow_executor']
     
-    def _get_project_root(self, project_id):
-        """Get the Flutter project root path for a project."""
+    def _resolve_paths(self, project_id):
+        """
+        Get a project's (Flutter project root, apps directory) paths.
+        
+        The Path objects are built once per project and reused for as long
+        as the project's configured path stays the same.
+        """
         project_service = self._get_project_service()
         project = project_service.get(project_id)
         
         if not project:
             raise ValueError(f"Project not found: {project_id}")
         
-        return Path(project['path'])
+        path = project['path']
+        cached = self._path_cache.get(project_id)
+        if cached is None or cached[0] != path:
+            cached = self._path_cache[project_id] = (
+                path, Path(path), self._projects_dir / project_id / "apps"
+            )
+        return cached[1], cached[2]
+    
+    def _get_project_root(self, project_id):
+        """Get the Flutter project root path for a project."""
+        return self._resolve_paths(project_id)[0]
     
     def _get_apps_dir(self, project_id):
         """Get the apps directory for a project."""
-        return self._projects_dir / project_id / "apps"
+        return self._resolve_paths(project_id)[1]
     
-    def build(self, app_id, platform="android", build_type="release", output_type="apk"):
+    def build(self, app_id, platform="android", build_type="release", output_type="apk", force_clean=False):
         """
         Build for a specific app and platform.
         
@@ -79,6 +186,8 @@ class BuildService:
             platform: Target platform ('android', 'ios', 'web', etc.)
             build_type: Build mode ('release' or 'debug')
             output_type: Output format (e.g., 'apk', 'appbundle')
+            force_clean: Always run `flutter clean`, even if nothing changed
+                         since the project's last successful build
             
         Returns:
             Build result dictionary with output path and status
@@ -93,17 +202,23 @@ class BuildService:
         if not project_id:
             raise ValueError("App is not associated with a project")
         
-        project_root = self._get_project_root(project_id)
-        apps_dir = self._get_apps_dir(project_id)
+        project_root, apps_dir = self._resolve_paths(project_id)
         
         supported_platforms = app_config.get('platforms', ['android'])
         if platform not in supported_platforms:
             raise ValueError(f"Platform '{platform}' is not supported by this app")
         
         build_id = str(uuid.uuid4())
-        self.build_logs[build_id] = []
-        self.current_build_id = build_id
-        self._build_start_time = datetime.now()
+        state = self._builds[build_id] = BuildState(
+            app_id=app_id,
+            platform=platform,
+            started_monotonic=time.monotonic(),
+            started_wall=datetime.now()
+        )
+        self._start_build_log(build_id)
+        
+        # Output files are named after the build's start time
+        safe_app_name = (app_config.get('appName') or app_id).translate(_FILENAME_UNSAFE)
         
         try:
             # Get platform handler
@@ -130,6 +245,7 @@ class BuildService:
                 "platform": platform,
                 "build_type": build_type,
                 "output_type": output_type,
+                "safe_app_name": safe_app_name,
             }
             
             # Step 1: Execute pre-build workflow steps and collect custom args
@@ -155,28 +271,37 @@ class BuildService:
                 
                 self._log(build_id, "Pre-build steps completed", "success")
             
-            # Step 2: Platform-specific setup
+            # Step 2: Platform-specific setup, while flutter clean runs. Clean
+            # is skipped if the project files and app config that affect the
+            # build are unchanged since the project's last successful build
+            # (hashed after pre-build steps, which may edit them)
             step_num = 2 if pre_steps else 1
             self._log(build_id, f"Step {step_num}: Setting up {platform} configuration...", "info")
-            handler.setup(app_id, app_config)
+            clean = force_clean or (
+                self._get_clean_hash(project_root, app_config) != self._load_clean_hash(project_id)
+            )
+            if not clean:
+                self._log(build_id, "Skipping flutter clean: nothing changed since the last build", "info")
+            self._setup_and_clean(handler, app_id, app_config, build_id, project_root, clean=clean)
             
             # Step 3: Run Flutter build
             step_num += 1
             self._log(build_id, f"Step {step_num}: Building {platform} {output_type}...", "info")
             
             output_path = self._run_flutter_build(
-                handler, build_type, output_type, build_id, project_root, custom_args
+                handler, build_type, output_type, build_id, project_root, custom_args,
+                pub_get=clean or not (project_root / ".dart_tool" / "package_config.json").exists()
             )
             
+            # Hash again, since pub get and the build may update pubspec.lock
+            self._save_clean_hash(project_id, self._get_clean_hash(project_root, app_config))
+            
             # Step 4: Move output to final location
             step_num += 1
             ext = handler.get_output_extension(output_type)
-            output_filename = (
-                f"{app_config['appName'].replace(' ', '_')}_{platform}_{build_type}_"
-                f"{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
-            )
+            output_filename = f"{safe_app_name}_{platform}_{build_type}_{state.started_wall:%Y%m%d_%H%M%S}{ext}"
             final_output_path = self._build_output_dir / output_filename
-            shutil.move(output_path, final_output_path)
+            self._move_output(output_path, final_output_path)
             
             # Update context with build output info for post-build steps
             workflow_context["output_path"] = str(final_output_path)
@@ -203,7 +328,7 @@ class BuildService:
             self._log(build_id, "Build completed successfully!", "success")
             
             # Log to build history
-            duration = self._get_build_duration()
+            duration = self._get_build_duration(build_id)
             self._log_to_history(project_id, app_id, {
                 "build_id": build_id,
                 "platform": platform,
@@ -214,7 +339,7 @@ class BuildService:
                 "duration": duration,
             })
             
-            self._reset_build_state()
+            self._reset_build_state(build_id)
             
             return {
                 "build_id": build_id,
@@ -228,8 +353,11 @@ class BuildService:
         except Exception as e:
             self._log(build_id, f"Build failed: {str(e)}", "error")
             
+            # Make sure the next build starts clean
+            self._save_clean_hash(project_id, None)
+            
             # Log failed build to history
-            duration = self._get_build_duration()
+            duration = self._get_build_duration(build_id)
             self._log_to_history(project_id, app_id, {
                 "build_id": build_id,
                 "platform": platform,
@@ -240,43 +368,198 @@ class BuildService:
                 "duration": duration,
             })
             
-            self._reset_build_state()
+            self._reset_build_state(build_id)
             raise
     
-    def stop_build(self):
-        """Stop the current build process."""
-        if self.current_process:
-            try:
-                self.current_process.terminate()
-                self.current_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.current_process.kill()
-            
-            if self.current_build_id:
-                self._log(self.current_build_id, "Build stopped by user", "warning")
+    def stop_build(self, build_id=None):
+        """
+        Stop a running build process.
+        
+        Args:
+            build_id: Build to stop; if omitted, all running builds are stopped
+        """
+        if build_id is None:
+            build_ids = list(self._builds)
+        else:
+            build_ids = [build_id]
+        
+        stopped = False
+        for bid in build_ids:
+            state = self._builds.get(bid)
+            process = state.process if state else None
+            if not process:
+                continue
             
-            self.current_process = None
-            self.current_build_id = None
+            state.process = None
+            # Log before stopping: once the process exits, the build thread
+            # fails the build and closes its log file
+            self._log(bid, "Build stopped by user", "warning")
+            self._stop_process(process)
+            stopped = True
+        
+        if stopped:
             return {"status": "stopped"}
         return {"status": "no_active_build"}
     
-    def get_logs(self, build_id):
-        """Get build logs for a specific build."""
-        return self.build_logs.get(build_id, [])
+    def _stop_process(self, process):
+        """
+        Stop a flutter process, escalating SIGINT -> SIGTERM -> SIGKILL.
+        
+        Flutter handles SIGINT like Ctrl-C and shuts its Gradle/Dart
+        children down cleanly; SIGTERM and finally SIGKILL are only sent
+        if it hasn't exited within the configured timeouts. On POSIX each
+        signal goes to the command's whole process group. Windows gets
+        CTRL_BREAK_EVENT (delivered to the process group) in place of
+        SIGINT, then terminate() and kill().
+        """
+        if sys.platform == 'win32':
+            phases = [
+                (lambda: process.send_signal(signal.CTRL_BREAK_EVENT), self._stop_sigint_timeout),
+                (process.terminate, self._stop_sigterm_timeout),
+                (process.kill, None),
+            ]
+        else:
+            def signal_group(sig):
+                # The command was started in its own session, so its
+                # process group ID is its PID
+                try:
+                    os.killpg(process.pid, sig)
+                except ProcessLookupError:
+                    pass
+            
+            phases = [
+                (lambda: signal_group(signal.SIGINT), self._stop_sigint_timeout),
+                (lambda: signal_group(signal.SIGTERM), self._stop_sigterm_timeout),
+                (lambda: signal_group(signal.SIGKILL), None),
+            ]
+        
+        for send, timeout in phases:
+            send()
+            try:
+                process.wait(timeout=timeout)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+    
+    def get_logs(self, build_id, full=True):
+        """
+        Get build logs for a specific build.
+        
+        Args:
+            build_id: The build identifier
+            full: Read the whole log from its file; if False (or there is no
+                  file), only the in-memory tail is returned
+        """
+        if full:
+            log_file = self._log_files.get(build_id)
+            if log_file is not None:
+                try:
+                    log_file.flush()
+                except ValueError:
+                    pass  # Closed as the build finished
+            
+            entries = self._read_log_file(build_id)
+            if entries is not None:
+                return entries
+        
+        return list(self.build_logs.get(build_id, ()))
+    
+    def _log_file_path(self, build_id):
+        """Get the JSONL log file path for a build."""
+        return self._build_logs_dir / f"{build_id}.jsonl"
+    
+    def _read_log_file(self, build_id):
+        """Read a build's log file, or return None if there isn't one."""
+        try:
+            # Build IDs are UUIDs; anything else can't name a log file
+            uuid.UUID(build_id)
+            data = self._log_file_path(build_id).read_bytes()
+        except (ValueError, OSError):
+            return None
+        return [orjson.loads(line) for line in data.splitlines() if line]
     
     def get_status(self):
-        """Get current build status and logs."""
-        if self.current_build_id:
+        """
+        Get current build status and logs.
+        
+        'build_id' and 'logs' describe the most recently started build;
+        'build_ids' and 'builds' list every build still running.
+        """
+        builds = list(self._builds.items())
+        if builds:
+            build_id = builds[-1][0]
             return {
                 "is_building": True,
-                "build_id": self.current_build_id,
-                "logs": self.build_logs.get(self.current_build_id, [])
+                "build_id": build_id,
+                "build_ids": [bid for bid, _ in builds],
+                "builds": [
+                    {
+                        "build_id": bid,
+                        "app_id": state.app_id,
+                        "platform": state.platform,
+                        "started_at": state.started_wall.isoformat(),
+                    }
+                    for bid, state in builds
+                ],
+                "logs": self.get_logs(build_id, full=False)
             }
-        return {"is_building": False, "build_id": None, "logs": []}
+        return {"is_building": False, "build_id": None, "build_ids": [], "builds": [], "logs": []}
+    
+    def _start_build_log(self, build_id):
+        """
+        Create the log for a new build, evicting the oldest finished
+        builds' logs beyond MAX_BUILD_LOGS.
+        """
+        self.build_logs[build_id] = deque(maxlen=MAX_LOG_LINES_PER_BUILD)
+        
+        excess = len(self.build_logs) - MAX_BUILD_LOGS
+        if excess > 0:
+            stale = [bid for bid in list(self.build_logs) if bid not in self._builds]
+            for bid in stale[:excess]:
+                self.build_logs.pop(bid, None)
+        
+        try:
+            self._build_logs_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_log_files()
+            self._log_files[build_id] = open(
+                self._log_file_path(build_id), 'wb', buffering=LOG_FILE_BUFFER_SIZE
+            )
+        except OSError as e:
+            print(f"Failed to open build log file: {e}")
+    
+    def _prune_log_files(self):
+        """Delete the oldest build log files beyond MAX_BUILD_LOG_FILES."""
+        with os.scandir(self._build_logs_dir) as it:
+            files = [entry for entry in it if entry.name.endswith('.jsonl')]
+        
+        if len(files) < MAX_BUILD_LOG_FILES:
+            return
+        
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - MAX_BUILD_LOG_FILES + 1]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+    
+    def _close_log_file(self, build_id):
+        """Flush and close a build's log file."""
+        log_file = self._log_files.pop(build_id, None)
+        if log_file is not None:
+            try:
+                log_file.close()
+            except OSError as e:
+                print(f"Failed to write build log file: {e}")
     
     def _log(self, build_id, message, level):
-        """Add log entry and emit real-time update."""
-        timestamp = datetime.now().isoformat()
+        """
+        Add log entry and queue it for the next real-time update.
+        
+        Entries are emitted to clients in 'build_logs_batch' events by
+        _emit_logs, either once LOG_BATCH_SIZE entries are pending or by a
+        background flusher every LOG_FLUSH_INTERVAL seconds.
+        """
+        timestamp = self._log_timestamp()
         log_entry = {
             "timestamp": timestamp,
             "message": message,
@@ -284,18 +567,141 @@ class BuildService:
         }
         self.build_logs[build_id].append(log_entry)
         
-        print(f"[{timestamp}] {level.upper()}: {message}")
+        log_file = self._log_files.get(build_id)
+        if log_file is not None:
+            try:
+                log_file.write(orjson.dumps(log_entry, option=orjson.OPT_APPEND_NEWLINE))
+            except (ValueError, OSError):
+                pass  # Closed as the build finished, or the disk is full
+        
+        # Flutter output is only streamed to clients, not echoed to the
+        # console, and not streamed either if STREAM_BUILD_OUTPUT is off
+        if level != "terminal":
+            print(f"[{timestamp}] {_LEVEL_LABELS.get(level) or level.upper()}: {message}")
+        elif not self._stream_build_output:
+            return
         
+        start_flusher = False
+        with self._log_lock:
+            buffer = self._log_buffer.setdefault(build_id, [])
+            buffer.append(log_entry)
+            
+            if len(buffer) >= LOG_BATCH_SIZE:
+                self._emit_logs(build_id, self._log_buffer.pop(build_id))
+            elif not self._log_flusher_running:
+                self._log_flusher_running = start_flusher = True
+        
+        if start_flusher:
+            socketio.start_background_task(self._flush_logs_loop)
+    
+    def _log_timestamp(self):
+        """
+        Get the ISO timestamp for a log entry, to the second (which is all
+        the console shows). Flutter prints many lines per second, so the
+        string is only re-formatted when the second changes.
+        """
+        now = int(time.time())
+        second, timestamp = self._timestamp_cache
+        if second != now:
+            timestamp = datetime.fromtimestamp(now).isoformat()
+            self._timestamp_cache = (now, timestamp)
+        return timestamp
+    
+    def _flush_logs_loop(self):
+        """Background task: emit pending log entries until none are left."""
+        while True:
+            socketio.sleep(LOG_FLUSH_INTERVAL)
+            with self._log_lock:
+                if not self._log_buffer:
+                    self._log_flusher_running = False
+                    return
+                for build_id, entries in self._log_buffer.items():
+                    self._emit_logs(build_id, entries)
+                self._log_buffer = {}
+    
+    def _flush_logs(self, build_id):
+        """Emit any pending log entries for a build right away."""
+        with self._log_lock:
+            entries = self._log_buffer.pop(build_id, None)
+            if entries:
+                self._emit_logs(build_id, entries)
+    
+    def _emit_logs(self, build_id, entries):
+        """
+        Emit a batch of log entries. Called with _log_lock held, so
+        batches for a build go out in order.
+        """
         try:
-            socketio = self._get_socketio()
-            socketio.emit('build_log', {
+            socketio.emit('build_logs_batch', {
                 'build_id': build_id,
-                'log_entry': log_entry
+                'entries': entries
             })
         except Exception as e:
-            print(f"Failed to emit log via WebSocket: {e}")
+            print(f"Failed to emit logs via WebSocket: {e}")
+    
+    def _get_clean_hash(self, project_root, app_config):
+        """Hash the project files and app config that decide whether to clean."""
+        digest = hashlib.sha256()
+        for rel_path in CLEAN_INPUT_FILES:
+            digest.update(rel_path.encode())
+            try:
+                data = (project_root / rel_path).read_bytes()
+            except OSError:
+                digest.update(b'-')
+                continue
+            digest.update(str(len(data)).encode())
+            digest.update(data)
+        digest.update(orjson.dumps(app_config, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS))
+        return digest.hexdigest()
+    
+    def _build_state_file(self, project_id):
+        """Get the file recording a project's last successful build inputs."""
+        return self._projects_dir / project_id / "build_state.json"
+    
+    def _load_clean_hash(self, project_id):
+        """Get the clean hash recorded for a project's last successful build."""
+        try:
+            return orjson.loads(self._build_state_file(project_id).read_bytes()).get('clean_hash')
+        except (OSError, orjson.JSONDecodeError, AttributeError):
+            return None
+    
+    def _save_clean_hash(self, project_id, clean_hash):
+        """Record a project's clean hash (None forces the next build to clean)."""
+        try:
+            write_atomic(self._build_state_file(project_id), orjson.dumps({"clean_hash": clean_hash}))
+        except OSError as e:
+            print(f"Failed to save build state: {e}")
     
-    def _run_flutter_build(self, handler, build_type, output_type, build_id, project_root, custom_args=None):
+    def _setup_and_clean(self, handler, app_id, app_config, build_id, project_root, clean=True):
+        """
+        Run the platform handler's setup and `flutter clean` concurrently.
+        
+        flutter clean runs on a worker thread while setup runs on this one.
+        The platform handlers' setup currently only logs; the project edits
+        (app name, package ID, icons) are made by the pre-build workflow
+        steps, which have already run. If a handler's setup starts editing
+        files again, check that those edits can't race with clean.
+        """
+        if not clean:
+            handler.setup(app_id, app_config)
+            return
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            clean_future = executor.submit(
+                self._run_flutter_command, ["flutter", "clean"], build_id, "Flutter clean", cwd=project_root
+            )
+            try:
+                handler.setup(app_id, app_config)
+            finally:
+                # Always wait for clean, so a setup failure doesn't leave it running
+                try:
+                    clean_future.result()
+                except subprocess.CalledProcessError as e:
+                    self._log(build_id, f"Flutter clean failed with exit code {e.returncode}", "error")
+                    raise
+    
+    def _run_flutter_build(self, handler, build_type, output_type, build_id, project_root, custom_args=None,
+                           pub_get=True):
         """
         Run Flutter build command using the platform handler.
         
@@ -306,6 +712,7 @@ class BuildService:
             build_id: Current build ID for logging
             project_root: Path to project root
             custom_args: Optional list of custom arguments from workflow steps
+            pub_get: Run `flutter pub get` first
             
         Returns:
             Path to the build output
@@ -314,24 +721,24 @@ class BuildService:
             custom_args = []
         
         try:
-            os.chdir(project_root)
-            
-            # Flutter clean
-            self._run_flutter_command(["flutter", "clean"], build_id, "Flutter clean")
+            # Commands run with cwd=project_root rather than chdir-ing the
+            # whole process, so builds of different projects can run at once.
+            # (flutter clean has already run, see _setup_and_clean.)
             
             # Flutter pub get
-            self._run_flutter_command(["flutter", "pub", "get"], build_id, "Flutter pub get")
+            if pub_get:
+                self._run_flutter_command(["flutter", "pub", "get"], build_id, "Flutter pub get", cwd=project_root)
             
-            # Build command from handler
-            build_command = handler.get_build_command(build_type, output_type)
+            # Build command from handler, copied since custom args are appended
+            build_command = list(self._get_build_command(handler, build_type, output_type))
             
             # Append custom arguments from workflow steps
             if custom_args:
                 build_command.extend(custom_args)
             
             # Run build command
-            self._log(build_id, f"Running command: {' '.join(build_command)}", "info")
-            self._run_flutter_command(build_command, build_id, "Flutter build")
+            self._log(build_id, f"Running command: {shlex.join(build_command)}", "info")
+            self._run_flutter_command(build_command, build_id, "Flutter build", cwd=project_root)
             
             self._log(build_id, "Flutter build completed", "success")
             
@@ -345,7 +752,18 @@ class BuildService:
             self._log(build_id, f"Build error: {str(e)}", "error")
             raise
     
-    def _run_flutter_command(self, command, build_id, description):
+    def _get_build_command(self, handler, build_type, output_type):
+        """
+        Get the handler's build command as a tuple. Commands only depend on
+        the platform, build type and output type, so each is built once.
+        """
+        key = (type(handler), build_type, output_type)
+        command = self._command_cache.get(key)
+        if command is None:
+            command = self._command_cache[key] = tuple(handler.get_build_command(build_type, output_type))
+        return command
+    
+    def _run_flutter_command(self, command, build_id, description, cwd=None):
         """
         Run a Flutter command and stream output to logs.
         
@@ -353,49 +771,103 @@ class BuildService:
             command: Command list for subprocess
             build_id: Current build ID for logging
             description: Human-readable description of the command
+            cwd: Directory to run the command in (the Flutter project root)
         """
         self._log(build_id, f"Running {description}...", "info")
         
-        process = subprocess.Popen(
+        # The build runs on its own request thread, which simply blocks on
+        # the pipe between output lines. The context manager closes the pipe
+        # and reaps the process even if streaming is interrupted.
+        with subprocess.Popen(
             command,
+            cwd=cwd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-        self.current_process = process
-        
-        for line in process.stdout:
-            line = line.strip()
-            if line:
-                self._log(build_id, line, "terminal")
+            **_NEW_PROCESS_GROUP
+        ) as process:
+            state = self._builds.get(build_id)
+            if state:
+                state.process = process
+            try:
+                self._stream_output(process.stdout, build_id)
+            finally:
+                if state and state.process is process:
+                    state.process = None
         
-        process.wait()
         if process.returncode != 0:
             raise subprocess.CalledProcessError(process.returncode, command[0])
         
         self._log(build_id, f"{description} completed", "success")
     
-    def _get_build_duration(self):
+    def _stream_output(self, stream, build_id):
+        """Log a command's output line by line (see process_output.read_lines)."""
+        def log_line(line):
+            line = line.strip()
+            if line:
+                self._log(build_id, line, "terminal")
+        
+        read_lines(stream, log_line, OUTPUT_READ_SIZE)
+    
+    def _move_output(self, src, dst):
+        """
+        Move a build output into the builds directory. A plain rename is
+        tried first; shutil.move's copy-and-delete is only used when the
+        two are on different filesystems.
+        """
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, dst)
+    
+    def _get_build_duration(self, build_id):
         """Calculate build duration in seconds."""
-        if self._build_start_time:
-            return int((datetime.now() - self._build_start_time).total_seconds())
+        state = self._builds.get(build_id)
+        if state:
+            return int(time.monotonic() - state.started_monotonic)
         return None
     
     def _log_to_history(self, project_id, app_id, record):
-        """Log build result to history service."""
-        try:
-            history_service = self._get_build_history_service()
-            history_service.add_record(project_id, app_id, record)
-        except Exception as e:
-            print(f"Failed to log build to history: {e}")
+        """
+        Queue a build result for the history service. Records are written
+        by a background thread, so the build doesn't wait on the disk.
+        """
+        if self._history_writer is None:
+            with self._history_writer_lock:
+                if self._history_writer is None:
+                    self._history_writer = threading.Thread(
+                        target=self._write_history, name="build-history-writer", daemon=True
+                    )
+                    self._history_writer.start()
+                    atexit.register(self._stop_history_writer)
+        
+        self._history_queue.put((project_id, app_id, record))
+    
+    def _write_history(self):
+        """Background thread: write queued build records to history."""
+        while True:
+            item = self._history_queue.get()
+            if item is None:
+                return
+            
+            project_id, app_id, record = item
+            try:
+                history_service = self._get_build_history_service()
+                history_service.add_record(project_id, app_id, record)
+            except Exception as e:
+                print(f"Failed to log build to history: {e}")
     
-    def _reset_build_state(self):
-        """Reset build state after completion or failure."""
-        self.current_build_id = None
-        self.current_process = None
-        self._build_start_time = None
+    def _stop_history_writer(self):
+        """Write out any queued build records and stop the writer thread."""
+        self._history_queue.put(None)
+        self._history_writer.join(timeout=5)
+    
+    def _reset_build_state(self, build_id):
+        """Reset a build's state after completion or failure."""
+        self._flush_logs(build_id)
+        self._close_log_file(build_id)
+        self._builds.pop(build_id, None)
     
     def _extract_custom_args(self, steps, results):
         """
@@ -408,15 +880,9 @@ class BuildService:
         Returns:
             List of custom arguments to append to the flutter command
         """
-        from .workflows.steps.custom_args_step import CustomArgsStep
-        
-        custom_args = []
-        
-        for i, step in enumerate(steps):
-            if step.get('type') == 'custom_args':
-                # Get arguments from step config
-                step_config = step.get('config', {})
-                args = CustomArgsStep.extract_arguments_from_config(step_config)
-                custom_args.extend(args)
-        
-        return custom_args
+        return [
+            arg
+            for step in steps
+            if step.get('type') == 'custom_args'
+            for arg in CustomArgsStep.extract_arguments_from_config(step.get('config', {}))
+        ]
@@ -2,12 +2,55 @@
 FlutterRunService - Manages Flutter run process for live development.
 """
 
-import json
+import os
+import shutil
 import subprocess
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
+from .process_output import read_lines
+from .workflows.steps.custom_args_step import CustomArgsStep
+
+# Run log entries are sent to clients in batches: at most every
+# LOG_FLUSH_INTERVAL seconds, or as soon as LOG_BATCH_SIZE entries are pending
+LOG_FLUSH_INTERVAL = 0.02
+LOG_BATCH_SIZE = 50
+
+# Only the last MAX_RUN_LOG_ENTRIES log entries of a run are kept
+# (overridden by the RUN_LOG_MAX_ENTRIES config setting)
+MAX_RUN_LOG_ENTRIES = 5000
+
+# Pipe buffer size for flutter run's output
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# Seconds a `flutter devices` listing is considered fresh; older listings
+# are still returned, while a refresh runs in the background
+DEVICES_CACHE_TTL = 5.0
+
+# Seconds callers wait for a device listing another request is fetching
+DEVICES_FETCH_TIMEOUT = 30
+
+# Seconds a project's detected platforms are reused without re-checking the disk
+PLATFORMS_CACHE_TTL = 5.0
+
+# Most `flutter clean` processes run at once when cleaning several projects
+MAX_PARALLEL_CLEANS = 4
+
+# Seconds `flutter clean` may run, and how much of its output is kept
+CLEAN_TIMEOUT = 120
+CLEAN_OUTPUT_LIMIT = 64 * 1024
+
+# Seconds the SDK versions reported by `flutter --version` are reused for
+SDK_VERSIONS_TTL = 600
+
+# Platform directories a Flutter project may contain (named after the platform)
+_PLATFORM_DIRS = frozenset(('android', 'ios', 'web', 'macos', 'windows', 'linux'))
 
 # Mapping from Flutter's targetPlatform to our platform names
 DEVICE_PLATFORM_MAP = {
@@ -36,6 +79,37 @@ DEVICE_PLATFORM_MAP = {
     'web': 'web',
 }
 
+# Platform names a device can map to
+_DEVICE_PLATFORMS = frozenset(DEVICE_PLATFORM_MAP.values())
+
+# `flutter run` flag for each run mode
+RUN_MODE_FLAGS = {
+    'debug': '--debug',
+    'profile': '--profile',
+    'release': '--release',
+}
+
+
+def _count_lines(path):
+    """
+    Count the lines of a file (a last line without a newline counts too).
+    
+    The file is read as bytes in large chunks and the newlines counted with
+    bytes.count, so no str objects are created per line.
+    """
+    lines = 0
+    last = b""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(OUTPUT_BUFFER_SIZE)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last = chunk
+    if last and not last.endswith(b"\n"):
+        lines += 1
+    return lines
+
 
 class FlutterRunService:
     """Service for managing Flutter run process for live development."""
@@ -45,9 +119,22 @@ class FlutterRunService:
         self.process = None
         self.device = None
         self.project_id = None
-        self.logs = []
+        self._max_log_entries = MAX_RUN_LOG_ENTRIES
+        self.logs = deque(maxlen=self._max_log_entries)  # (timestamp, message, level or None)
         self.is_running = False
         self._log_thread = None
+        self._clients = 0  # Connected Socket.IO clients
+        self._device_cache = {}  # project_id -> (expires_at, device list)
+        self._device_fetches = {}  # project_id -> Event set when its fetch finishes
+        self._device_lock = threading.Lock()
+        self._platforms_cache = {}  # project_id -> (project root, root mtime_ns, platforms, checked_at)
+        self._pubspec_cache = {}  # pubspec path -> ((mtime_ns, size), pubspec info)
+        self._sdk_versions_cache = (None, 0.0, None)  # (flutter binary, expires_at, versions)
+        self._project_roots = {}  # project_id -> (configured path, Path)
+        self._log_buffer = []  # Log entries not yet emitted
+        self._log_lock = threading.Lock()
+        self._log_flusher_running = False
+        self._timestamp_cache = (None, None)  # (epoch millisecond, ISO string)
         
         if app is not None:
             self.init_app(app)
@@ -55,6 +142,8 @@ class FlutterRunService:
     def init_app(self, app):
         """Initialize with Flask app."""
         self.app = app
+        self._max_log_entries = app.config.get('RUN_LOG_MAX_ENTRIES', MAX_RUN_LOG_ENTRIES)
+        self.logs = deque(self.logs, maxlen=self._max_log_entries)
     
     def _get_socketio(self):
         """Get socketio from extensions."""
@@ -74,54 +163,159 @@ class FlutterRunService:
         return self.app.extensions['workflow_executor']
     
     def _get_project_root(self, project_id):
-        """Get the Flutter project root path for a project."""
+        """
+        Get the Flutter project root path for a project.
+        
+        The Path is reused while the project's configured path is unchanged,
+        so repeat lookups don't build a new one.
+        """
         project_service = self._get_project_service()
         project = project_service.get(project_id)
         
         if not project:
             raise ValueError(f"Project not found: {project_id}")
         
-        return Path(project['path'])
+        path = project['path']
+        cached = self._project_roots.get(project_id)
+        if cached and cached[0] == path:
+            return cached[1]
+        
+        project_root = Path(path)
+        self._project_roots[project_id] = (path, project_root)
+        return project_root
     
     def _get_project_platforms(self, project_id):
         """
         Get supported platforms for a project by checking platform directories.
         
         Returns a set of platform names (android, ios, web, macos, windows, linux).
+        
+        Results are cached per project. For PLATFORMS_CACHE_TTL seconds they
+        are reused without touching the disk; after that they are reused
+        while the project root's modification time is unchanged (adding or
+        removing a platform directory updates it), which costs a single stat.
         """
         try:
             project_root = self._get_project_root(project_id)
         except ValueError:
             return set()
         
-        platform_dirs = {
-            'android': 'android',
-            'ios': 'ios',
-            'web': 'web',
-            'macos': 'macos',
-            'windows': 'windows',
-            'linux': 'linux',
-        }
+        now = time.monotonic()
+        cached = self._platforms_cache.get(project_id)
+        if cached and cached[0] == project_root and now - cached[3] < PLATFORMS_CACHE_TTL:
+            return set(cached[2])
         
-        platforms = set()
-        for platform, dir_name in platform_dirs.items():
-            platform_path = project_root / dir_name
-            if platform_path.exists() and platform_path.is_dir():
-                platforms.add(platform)
+        try:
+            root_mtime = project_root.stat().st_mtime_ns
+        except OSError:
+            return set()
         
-        return platforms
-    
-    def _map_device_platform(self, target_platform):
-        """Map Flutter's targetPlatform to our platform name."""
-        return DEVICE_PLATFORM_MAP.get(target_platform, None)
+        if cached and cached[0] == project_root and cached[1] == root_mtime:
+            self._platforms_cache[project_id] = (project_root, root_mtime, cached[2], now)
+            return set(cached[2])
+        
+        # One directory listing instead of a stat per platform; DirEntry.is_dir()
+        # is answered from the listing's file type wherever the OS provides it
+        try:
+            with os.scandir(project_root) as it:
+                platforms = frozenset(
+                    entry.name for entry in it
+                    if entry.name in _PLATFORM_DIRS and entry.is_dir()
+                )
+        except OSError:
+            return set()
+        self._platforms_cache[project_id] = (project_root, root_mtime, platforms, now)
+        
+        return set(platforms)
     
-    def get_devices(self, project_id=None):
+    def get_devices(self, project_id=None, refresh=False):
         """
         Get list of available Flutter devices.
         
         If project_id is provided, filters devices to only include those
-        for platforms that the project supports.
+        for platforms that the project supports. With refresh, a new
+        listing is fetched instead of using the cached one.
+        """
+        device_list = self._list_devices(project_id, refresh=refresh)
+        
+        # Filter by project platforms if project_id is provided
+        if project_id:
+            supported_platforms = self._get_project_platforms(project_id)
+            if supported_platforms:
+                return [
+                    d for d in device_list 
+                    if d.get("platform_type") in supported_platforms
+                ]
+        
+        return list(device_list)
+    
+    def _lookup_device_platform(self, device_id, project_id=None):
+        """
+        Get the platform type of a device, from the cached device listing.
+        
+        A device missing from the cached listing may have been connected
+        since it was taken, so the listing is refreshed once before giving up.
+        """
+        for refresh in (False, True):
+            for d in self._list_devices(project_id, refresh=refresh):
+                if d.get('id') == device_id:
+                    return d.get('platform_type')
+        return None
+    
+    def _list_devices(self, project_id=None, refresh=False):
         """
+        Get all available Flutter devices (unfiltered).
+        
+        Listing devices runs `flutter devices`, which takes hundreds of
+        milliseconds, so requests are served from a cached listing. Once it
+        is older than DEVICES_CACHE_TTL seconds the stale listing is still
+        returned, and a refresh is started in the background. Only the
+        first listing (or an explicit refresh) waits for the subprocess.
+        """
+        cached = self._device_cache.get(project_id)
+        
+        if cached and not refresh:
+            if cached[0] <= time.monotonic():
+                event, owner = self._claim_device_fetch(project_id)
+                if owner:
+                    self._get_socketio().start_background_task(self._refresh_devices, project_id, event)
+            return cached[1]
+        
+        # Fetch now; if another request is already fetching, wait for it
+        event, owner = self._claim_device_fetch(project_id)
+        if owner:
+            self._refresh_devices(project_id, event)
+        else:
+            event.wait(DEVICES_FETCH_TIMEOUT)
+        
+        cached = self._device_cache.get(project_id)
+        return cached[1] if cached else []
+    
+    def _claim_device_fetch(self, project_id):
+        """
+        Get the Event for a project's device fetch, and whether the caller
+        owns (and so must run) the fetch rather than wait for it.
+        """
+        with self._device_lock:
+            event = self._device_fetches.get(project_id)
+            if event is not None:
+                return event, False
+            event = self._device_fetches[project_id] = threading.Event()
+            return event, True
+    
+    def _refresh_devices(self, project_id, event):
+        """Fetch and cache a device listing, then release its waiters."""
+        try:
+            device_list = self._fetch_devices(project_id)
+            if device_list is not None:
+                self._device_cache[project_id] = (time.monotonic() + DEVICES_CACHE_TTL, device_list)
+        finally:
+            with self._device_lock:
+                self._device_fetches.pop(project_id, None)
+            event.set()
+    
+    def _fetch_devices(self, project_id=None):
+        """Run `flutter devices`; returns None if it fails."""
         try:
             # Use project path if provided, otherwise use a temp directory
             cwd = None
@@ -134,60 +328,103 @@ class FlutterRunService:
             result = subprocess.run(
                 ["flutter", "devices", "--machine"],
                 capture_output=True,
-                text=True,
                 cwd=cwd
             )
             if result.returncode != 0:
-                return []
+                return None
             
-            devices = json.loads(result.stdout)
+            # Parse the raw stdout bytes; orjson decodes the UTF-8 itself
+            devices = orjson.loads(result.stdout)
             
-            # Build device list with platform mapping
-            device_list = []
-            for d in devices:
-                target_platform = d.get("targetPlatform", "unknown")
-                platform_type = self._map_device_platform(target_platform)
-                
-                device_list.append({
+            # Build device list, mapping Flutter's targetPlatform to our platform name
+            return [
+                {
                     "id": d.get("id", ""),
                     "name": d.get("name", "Unknown"),
-                    "platform": target_platform,
-                    "platform_type": platform_type,
+                    "platform": d.get("targetPlatform", "unknown"),
+                    "platform_type": DEVICE_PLATFORM_MAP.get(d.get("targetPlatform")),
                     "isEmulator": d.get("emulator", False)
-                })
-            
-            # Filter by project platforms if project_id is provided
-            if project_id:
-                supported_platforms = self._get_project_platforms(project_id)
-                if supported_platforms:
-                    device_list = [
-                        d for d in device_list 
-                        if d.get("platform_type") in supported_platforms
-                    ]
-            
-            return device_list
+                }
+                for d in devices
+            ]
         except Exception as e:
             print(f"Error getting devices: {e}")
-            return []
+            return None
     
     def _log_to_console(self, message, level="info"):
         """Log message to console and emit via websocket."""
-        timestamp = datetime.now().isoformat()
-        log_entry = {
+        timestamp = self._log_timestamp()
+        self.logs.append((timestamp, message, level))
+        print(f"[{timestamp}] {level.upper()}: {message}")
+        self._queue_log({
             "timestamp": timestamp,
             "message": message,
             "level": level
-        }
-        self.logs.append(log_entry)
-        print(f"[{timestamp}] {level.upper()}: {message}")
+        })
+    
+    def _log_timestamp(self):
+        """
+        Get the ISO timestamp for a log entry, to the millisecond. Flutter
+        can print bursts of lines within the same millisecond, so the
+        string is only re-formatted when the millisecond changes.
+        """
+        now_ms = time.time_ns() // 1_000_000
+        ms, timestamp = self._timestamp_cache
+        if ms != now_ms:
+            timestamp = datetime.fromtimestamp(now_ms / 1000).isoformat(timespec='milliseconds')
+            self._timestamp_cache = (now_ms, timestamp)
+        return timestamp
+    
+    def _queue_log(self, log_entry):
+        """
+        Queue a log entry for the next real-time update.
         
+        Entries are emitted to clients in 'run_logs_batch' events by
+        _emit_logs, either once LOG_BATCH_SIZE entries are pending or by a
+        background flusher every LOG_FLUSH_INTERVAL seconds.
+        """
+        start_flusher = False
+        with self._log_lock:
+            self._log_buffer.append(log_entry)
+            
+            if len(self._log_buffer) >= LOG_BATCH_SIZE:
+                self._emit_logs()
+            elif not self._log_flusher_running:
+                self._log_flusher_running = start_flusher = True
+        
+        if start_flusher:
+            self._get_socketio().start_background_task(self._flush_logs_loop)
+    
+    def _flush_logs_loop(self):
+        """Background task: emit pending log entries until none are left."""
+        socketio = self._get_socketio()
+        while True:
+            socketio.sleep(LOG_FLUSH_INTERVAL)
+            with self._log_lock:
+                if not self._log_buffer:
+                    self._log_flusher_running = False
+                    return
+                self._emit_logs()
+    
+    def _flush_logs(self):
+        """Emit any pending log entries right away."""
+        with self._log_lock:
+            if self._log_buffer:
+                self._emit_logs()
+    
+    def _emit_logs(self):
+        """
+        Emit and clear the pending log entries. Called with _log_lock held,
+        so batches go out in order.
+        """
+        entries, self._log_buffer = self._log_buffer, []
         try:
             socketio = self._get_socketio()
-            socketio.emit('run_log', {'log_entry': log_entry})
+            socketio.emit('run_logs_batch', {'entries': entries})
         except Exception as e:
-            print(f"Failed to emit log: {e}")
+            print(f"Failed to emit logs: {e}")
     
-    def start(self, device_id, project_id, app_id=None, run_mode='debug'):
+    def start(self, device_id, project_id, app_id=None, run_mode='debug', device_platform=None):
         """Start Flutter run on specified device for a project.
         
         Args:
@@ -195,7 +432,12 @@ class FlutterRunService:
             project_id: The project ID
             app_id: Optional app ID to get run settings from
             run_mode: Run mode - 'debug', 'profile', or 'release' (default: 'debug')
+            device_platform: Optional platform type of the device (e.g. 'android'),
+                as given in the device listing; looked up if not provided
         """
+        if device_platform not in _DEVICE_PLATFORMS:
+            device_platform = None
+        
         if self.is_running:
             raise ValueError("Flutter is already running")
         
@@ -204,35 +446,28 @@ class FlutterRunService:
         
         project_root = self._get_project_root(project_id)
         
+        # Re-detect the project's platforms on the next lookup
+        self._platforms_cache.pop(project_id, None)
+        
         self.device = device_id
         self.project_id = project_id
-        self.logs = []
+        self.logs = deque(maxlen=self._max_log_entries)
         self.is_running = True
         
         try:
             # Build command with run mode flag
-            mode_flags = {
-                'debug': '--debug',
-                'profile': '--profile',
-                'release': '--release',
-            }
-            mode_flag = mode_flags.get(run_mode, '--debug')
+            mode_flag = RUN_MODE_FLAGS.get(run_mode, '--debug')
             cmd = ["flutter", "run", "-d", device_id, mode_flag]
             
             run_settings = None
-            device_platform = None
             custom_args = []
             
-            # Get run settings from app if provided
+            # Get run settings from app if provided, by the device's platform
+            # (also used for the workflow context)
             if app_id:
-                run_settings = self._get_run_settings(app_id, device_id)
-                
-                # Get device platform for workflow context
-                devices = self.get_devices()
-                for d in devices:
-                    if d.get('id') == device_id:
-                        device_platform = d.get('platform_type')
-                        break
+                if not device_platform:
+                    device_platform = self._lookup_device_platform(device_id, project_id)
+                run_settings = self._get_run_settings(app_id, device_platform)
             
             # Execute pre-run workflow steps and collect custom args
             if run_settings:
@@ -276,8 +511,7 @@ class FlutterRunService:
                     self._log_to_console("Pre-run steps completed", "success")
             
             # Append custom arguments from workflow steps
-            if custom_args:
-                cmd.extend(custom_args)
+            cmd.extend(custom_args)
             
             # Log the command being run
             self._log_to_console(f"Starting Flutter run in {run_mode} mode...", "info")
@@ -288,8 +522,7 @@ class FlutterRunService:
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                bufsize=OUTPUT_BUFFER_SIZE,
                 cwd=project_root
             )
             
@@ -298,8 +531,9 @@ class FlutterRunService:
             self._current_app_id = app_id
             self._current_device_platform = device_platform
             
-            self._log_thread = threading.Thread(target=self._stream_logs, daemon=True)
-            self._log_thread.start()
+            # Read output on a Socket.IO background task: a daemon thread in
+            # threading mode, a green thread under eventlet/gevent
+            self._log_thread = self._get_socketio().start_background_task(self._stream_logs)
             
             return {"status": "running", "device": device_id, "project_id": project_id}
         except Exception as e:
@@ -308,12 +542,12 @@ class FlutterRunService:
             self.project_id = None
             raise e
     
-    def _get_run_settings(self, app_id, device_id):
+    def _get_run_settings(self, app_id, device_platform):
         """Get run settings for the app based on device platform.
         
         Args:
             app_id: The app ID to get settings from
-            device_id: The device ID to determine platform
+            device_platform: The device's platform type (e.g. 'android')
             
         Returns:
             Run settings dict with 'workflow', or None
@@ -329,15 +563,6 @@ class FlutterRunService:
             if not build_settings:
                 return None
             
-            # Determine platform from device
-            # First, get device info to find its platform
-            devices = self.get_devices()
-            device_platform = None
-            for d in devices:
-                if d.get('id') == device_id:
-                    device_platform = d.get('platform_type')
-                    break
-            
             if not device_platform:
                 return None
             
@@ -360,37 +585,20 @@ class FlutterRunService:
         Returns:
             List of custom arguments to append to the flutter command
         """
-        from .workflows.steps.custom_args_step import CustomArgsStep
-        
-        custom_args = []
-        
-        for i, step in enumerate(steps):
-            if step.get('type') == 'custom_args':
-                # Get arguments from step config
-                step_config = step.get('config', {})
-                args = CustomArgsStep.extract_arguments_from_config(step_config)
-                custom_args.extend(args)
-        
-        return custom_args
+        return [
+            arg
+            for step in steps
+            if step.get('type') == 'custom_args'
+            for arg in CustomArgsStep.extract_arguments_from_config(step.get('config', {}))
+        ]
     
     def _stream_logs(self):
-        """Stream logs from Flutter process."""
+        """Stream logs from Flutter process (see process_output.read_lines)."""
         try:
-            for line in self.process.stdout:
-                line = line.strip()
-                if line:
-                    log_entry = {
-                        "timestamp": datetime.now().isoformat(),
-                        "message": line,
-                        "level": self._detect_log_level(line)
-                    }
-                    self.logs.append(log_entry)
-                    
-                    try:
-                        socketio = self._get_socketio()
-                        socketio.emit('run_log', {'log_entry': log_entry})
-                    except Exception as e:
-                        print(f"Failed to emit flutter log: {e}")
+            read_lines(self.process.stdout, self._handle_line, OUTPUT_BUFFER_SIZE)
+            
+            # Send the last lines before the stopped status
+            self._flush_logs()
             
             self.is_running = False
             self.device = None
@@ -404,16 +612,40 @@ class FlutterRunService:
             print(f"Log streaming error: {e}")
             self.is_running = False
     
+    def _handle_line(self, line):
+        """
+        Record a line of flutter run output and queue it for clients.
+        
+        With no client connected the line is only kept in the log, and its
+        level is detected if and when get_logs asks for it.
+        """
+        line = line.strip()
+        if not line:
+            return
+        
+        timestamp = self._log_timestamp()
+        if not self._clients:
+            self.logs.append((timestamp, line, None))
+            return
+        
+        level = self._detect_log_level(line)
+        self.logs.append((timestamp, line, level))
+        self._queue_log({
+            "timestamp": timestamp,
+            "message": line,
+            "level": level
+        })
+    
     def _detect_log_level(self, line):
         """Detect log level from line content."""
         line_lower = line.lower()
         if 'error' in line_lower or 'exception' in line_lower:
             return 'error'
-        elif 'warning' in line_lower or 'warn' in line_lower:
+        elif 'warn' in line_lower:  # also matches 'warning'
             return 'warning'
         elif 'success' in line_lower or 'built' in line_lower or 'synced' in line_lower:
             return 'success'
-        elif line.startswith('I/') or line.startswith('D/') or 'info' in line_lower:
+        elif line.startswith(('I/', 'D/')) or 'info' in line_lower:
             return 'info'
         return 'terminal'
     
@@ -423,7 +655,7 @@ class FlutterRunService:
             return {"status": "stopped"}
         
         try:
-            self.process.stdin.write('q\n')
+            self.process.stdin.write(b'q\n')
             self.process.stdin.flush()
             self.process.wait(timeout=10)
         except subprocess.TimeoutExpired:
@@ -486,7 +718,7 @@ class FlutterRunService:
             raise ValueError("Flutter is not running")
         
         try:
-            self.process.stdin.write('r\n')
+            self.process.stdin.write(b'r\n')
             self.process.stdin.flush()
             return {"status": "reloading"}
         except Exception as e:
@@ -498,7 +730,7 @@ class FlutterRunService:
             raise ValueError("Flutter is not running")
         
         try:
-            self.process.stdin.write('R\n')
+            self.process.stdin.write(b'R\n')
             self.process.stdin.flush()
             return {"status": "restarting"}
         except Exception as e:
@@ -513,8 +745,25 @@ class FlutterRunService:
         }
     
     def get_logs(self):
-        """Get all logs."""
-        return self.logs
+        """Get the run's logs (the last RUN_LOG_MAX_ENTRIES entries)."""
+        return [
+            {
+                "timestamp": timestamp,
+                "message": message,
+                "level": level or self._detect_log_level(message)
+            }
+            for timestamp, message, level in list(self.logs)
+        ]
+    
+    def client_connected(self):
+        """Note a Socket.IO client connecting; run output is emitted while any are."""
+        with self._log_lock:
+            self._clients += 1
+    
+    def client_disconnected(self):
+        """Note a Socket.IO client disconnecting."""
+        with self._log_lock:
+            self._clients = max(self._clients - 1, 0)
     
     def clean_project(self, project_id):
         """Run flutter clean on a project.
@@ -523,35 +772,59 @@ class FlutterRunService:
             project_id: The project ID to clean
             
         Returns:
-            dict with status and message
+            dict with status, message and the combined stdout/stderr output
+            (its last CLEAN_OUTPUT_LIMIT bytes)
+        
+        Output is read in chunks as it is produced and only its tail is
+        kept, so a verbose clean doesn't pile up in memory.
         """
         project_root = self._get_project_root(project_id)
+        timed_out = threading.Event()
         
         try:
-            result = subprocess.run(
+            with subprocess.Popen(
                 ["flutter", "clean"],
                 cwd=project_root,
-                capture_output=True,
-                text=True,
-                timeout=120  # 2 minute timeout
-            )
-            
-            if result.returncode == 0:
-                return {
-                    "status": "success",
-                    "message": "Flutter clean completed successfully",
-                    "output": result.stdout
-                }
-            else:
-                return {
-                    "status": "error",
-                    "message": "Flutter clean failed",
-                    "output": result.stderr or result.stdout
-                }
-        except subprocess.TimeoutExpired:
-            raise ValueError("Flutter clean timed out")
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=OUTPUT_BUFFER_SIZE
+            ) as process:
+                def kill_on_timeout():
+                    timed_out.set()
+                    process.kill()
+                
+                timer = threading.Timer(CLEAN_TIMEOUT, kill_on_timeout)
+                timer.start()
+                try:
+                    output = bytearray()
+                    while True:
+                        chunk = process.stdout.read1(OUTPUT_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        output += chunk
+                        if len(output) > 2 * CLEAN_OUTPUT_LIMIT:
+                            del output[:-CLEAN_OUTPUT_LIMIT]
+                    returncode = process.wait()
+                finally:
+                    timer.cancel()
         except Exception as e:
             raise ValueError(f"Flutter clean failed: {e}")
+        
+        if timed_out.is_set():
+            raise ValueError("Flutter clean timed out")
+        
+        output = output[-CLEAN_OUTPUT_LIMIT:].decode("utf-8", "replace")
+        if returncode == 0:
+            return {
+                "status": "success",
+                "message": "Flutter clean completed successfully",
+                "output": output
+            }
+        return {
+            "status": "error",
+            "message": "Flutter clean failed",
+            "output": output
+        }
     
     def clean_projects(self, project_ids):
         """Run flutter clean on multiple projects.
@@ -560,33 +833,41 @@ class FlutterRunService:
             project_ids: List of project IDs to clean
             
         Returns:
-            List of results with project_id, status, and message for each
+            List of results with project_id, status, and message for each,
+            in the order of project_ids
+        
+        The projects are cleaned concurrently (up to MAX_PARALLEL_CLEANS at
+        a time), as each clean mostly waits on its flutter subprocess.
         """
-        results = []
+        if not project_ids:
+            return []
         
-        for project_id in project_ids:
-            try:
-                # Get project name for better reporting
-                project_service = self._get_project_service()
-                project = project_service.get(project_id)
-                project_name = project.get('name', project_id) if project else project_id
-                
-                result = self.clean_project(project_id)
-                results.append({
-                    "project_id": project_id,
-                    "project_name": project_name,
-                    "status": result.get("status", "error"),
-                    "message": result.get("message", "Unknown error"),
-                })
-            except Exception as e:
-                results.append({
-                    "project_id": project_id,
-                    "project_name": project_id,
-                    "status": "error",
-                    "message": str(e),
-                })
-        
-        return results
+        workers = min(len(project_ids), os.cpu_count() or 1, MAX_PARALLEL_CLEANS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._clean_project_result, project_ids))
+    
+    def _clean_project_result(self, project_id):
+        """Clean one project of a clean_projects batch, reporting any error."""
+        try:
+            # Get project name for better reporting
+            project_service = self._get_project_service()
+            project = project_service.get(project_id)
+            project_name = project.get('name', project_id) if project else project_id
+            
+            result = self.clean_project(project_id)
+            return {
+                "project_id": project_id,
+                "project_name": project_name,
+                "status": result.get("status", "error"),
+                "message": result.get("message", "Unknown error"),
+            }
+        except Exception as e:
+            return {
+                "project_id": project_id,
+                "project_name": project_id,
+                "status": "error",
+                "message": str(e),
+            }
     
     def get_project_info(self, project_id):
         """Get detailed information about a Flutter project.
@@ -609,16 +890,30 @@ class FlutterRunService:
         return info
     
     def _get_pubspec_info(self, project_root):
-        """Parse pubspec.yaml and extract key information."""
+        """
+        Parse pubspec.yaml and extract key information.
+        
+        The result is cached per file and reused until the file's
+        modification time or size changes.
+        """
         pubspec_path = project_root / "pubspec.yaml"
         
-        if not pubspec_path.exists():
+        try:
+            st = pubspec_path.stat()
+        except OSError:
             return None
         
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._pubspec_cache.get(pubspec_path)
+        if cached and cached[0] == signature:
+            return dict(cached[1])
+        
         try:
             import yaml
-            with open(pubspec_path, 'r') as f:
-                pubspec = yaml.safe_load(f)
+            # libyaml's C loader when PyYAML was built with it
+            loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+            with open(pubspec_path, 'rb') as f:
+                pubspec = yaml.load(f, Loader=loader)
             
             dependencies = pubspec.get('dependencies', {})
             dev_dependencies = pubspec.get('dev_dependencies', {})
@@ -627,35 +922,56 @@ class FlutterRunService:
             dep_count = len([k for k in dependencies.keys() if k != 'flutter'])
             dev_dep_count = len(dev_dependencies)
             
-            return {
+            info = {
                 "name": pubspec.get('name', 'Unknown'),
                 "version": pubspec.get('version', '0.0.0'),
                 "description": pubspec.get('description', ''),
                 "dependencies_count": dep_count,
                 "dev_dependencies_count": dev_dep_count,
             }
+            self._pubspec_cache[pubspec_path] = (signature, info)
+            return dict(info)
         except Exception as e:
             print(f"Error parsing pubspec.yaml: {e}")
             return None
     
     def _get_sdk_versions(self, project_root):
-        """Get Flutter and Dart SDK versions."""
+        """
+        Get Flutter and Dart SDK versions.
+        
+        The SDK is the same for every project, so a successful result is
+        shared by all of them for SDK_VERSIONS_TTL seconds. It is keyed by
+        the resolved flutter binary and its modification time, so pointing
+        PATH at another SDK is picked up straight away.
+        """
+        flutter_bin = shutil.which("flutter")
+        try:
+            sdk_key = (flutter_bin, os.stat(flutter_bin).st_mtime_ns) if flutter_bin else None
+        except OSError:
+            sdk_key = None
+        
+        cached_key, expires_at, cached_versions = self._sdk_versions_cache
+        if sdk_key and cached_key == sdk_key and time.monotonic() < expires_at:
+            return dict(cached_versions)
+        
         try:
             result = subprocess.run(
                 ["flutter", "--version", "--machine"],
                 cwd=project_root,
                 capture_output=True,
-                text=True,
                 timeout=30
             )
             
             if result.returncode == 0:
-                version_info = json.loads(result.stdout)
-                return {
+                version_info = orjson.loads(result.stdout)
+                versions = {
                     "flutter": version_info.get('frameworkVersion', 'Unknown'),
                     "dart": version_info.get('dartSdkVersion', 'Unknown').split(' ')[0],
                     "channel": version_info.get('channel', 'Unknown'),
                 }
+                if sdk_key:
+                    self._sdk_versions_cache = (sdk_key, time.monotonic() + SDK_VERSIONS_TTL, versions)
+                return dict(versions)
         except Exception as e:
             print(f"Error getting SDK versions: {e}")
         
@@ -673,26 +989,17 @@ class FlutterRunService:
         }
         
         try:
-            lib_dir = project_root / "lib"
-            if lib_dir.exists():
-                for dart_file in lib_dir.rglob("*.dart"):
-                    stats["dart_files"] += 1
-                    try:
-                        with open(dart_file, 'r', encoding='utf-8', errors='ignore') as f:
-                            stats["total_lines"] += sum(1 for _ in f)
-                    except Exception:
-                        pass
-            
-            # Also count test files
-            test_dir = project_root / "test"
-            if test_dir.exists():
-                for dart_file in test_dir.rglob("*.dart"):
-                    stats["dart_files"] += 1
-                    try:
-                        with open(dart_file, 'r', encoding='utf-8', errors='ignore') as f:
-                            stats["total_lines"] += sum(1 for _ in f)
-                    except Exception:
-                        pass
+            # Source and test files (os.walk gets file types from the
+            # directory listings, so nothing is stat'ed to find them)
+            for source_dir in (project_root / "lib", project_root / "test"):
+                for dirpath, _, filenames in os.walk(source_dir):
+                    for filename in filenames:
+                        if filename.endswith(".dart"):
+                            stats["dart_files"] += 1
+                            try:
+                                stats["total_lines"] += _count_lines(os.path.join(dirpath, filename))
+                            except OSError:
+                                pass
         except Exception as e:
             print(f"Error getting project stats: {e}")
         
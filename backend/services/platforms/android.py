@@ -8,7 +8,7 @@ Setup operations are now handled by the AndroidSetupStep workflow step.
 from pathlib import Path
 from typing import Optional
 
-from .base import PlatformHandler
+from .base import BUILD_MODE_FLAGS, PlatformHandler
 
 
 class AndroidHandler(PlatformHandler):
@@ -33,12 +33,7 @@ class AndroidHandler(PlatformHandler):
     
     def get_build_command(self, build_type: str, output_type: str) -> list:
         """Return the Flutter build command for Android."""
-        mode_flags = {
-            "release": "--release",
-            "debug": "--debug",
-            "profile": "--profile",
-        }
-        mode_flag = mode_flags.get(build_type, "--release")
+        mode_flag = BUILD_MODE_FLAGS.get(build_type, "--release")
         
         if output_type == "appbundle":
             return ["flutter", "build", "appbundle", mode_flag]
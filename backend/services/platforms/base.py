@@ -9,6 +9,13 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Callable, Optional
 
+# `flutter build` flag for each build mode
+BUILD_MODE_FLAGS = {
+    "release": "--release",
+    "debug": "--debug",
+    "profile": "--profile",
+}
+
 
 class PlatformHandler(ABC):
     """
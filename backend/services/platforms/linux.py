@@ -10,7 +10,7 @@ Handles Linux-specific setup and build operations including:
 from pathlib import Path
 from typing import Optional
 
-from .base import PlatformHandler
+from .base import BUILD_MODE_FLAGS, PlatformHandler
 
 
 class LinuxHandler(PlatformHandler):
@@ -42,12 +42,7 @@ class LinuxHandler(PlatformHandler):
     
     def get_build_command(self, build_type: str, output_type: str) -> list:
         """Return the Flutter build command for Linux."""
-        mode_flags = {
-            "release": "--release",
-            "debug": "--debug",
-            "profile": "--profile",
-        }
-        mode_flag = mode_flags.get(build_type, "--release")
+        mode_flag = BUILD_MODE_FLAGS.get(build_type, "--release")
         return ["flutter", "build", "linux", mode_flag]
     
     def find_build_output(self, build_type: str, output_type: str) -> Path:
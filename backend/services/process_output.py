@@ -0,0 +1,35 @@
+"""
+Helpers for reading the output of flutter subprocesses.
+"""
+
+
+def read_lines(stream, on_line, read_size):
+    """
+    Call on_line with each line of a binary stream, decoded as UTF-8.
+    
+    Output is read as raw bytes in whatever chunks are available
+    (read1 doesn't wait for a full buffer, so lines still appear live),
+    and the complete lines of each chunk are decoded in one go instead
+    of per line. A partial line is carried over in a bytearray, which
+    grows in place rather than being copied on every chunk.
+    """
+    pending = bytearray()
+    while True:
+        chunk = stream.read1(read_size)
+        if not chunk:
+            break
+        
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            pending += chunk
+            continue
+        
+        pending += chunk[:end]
+        text = pending.decode("utf-8", "replace")
+        pending = bytearray(chunk[end + 1:])
+        for line in text.splitlines():
+            on_line(line)
+    
+    # Output that didn't end with a newline
+    for line in pending.decode("utf-8", "replace").splitlines():
+        on_line(line)
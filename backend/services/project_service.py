@@ -2,14 +2,17 @@
 ProjectService - Handles Flutter project management and persistence.
 """
 
-import json
 import re
+import secrets
 import shutil
 import subprocess
-import uuid
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
+from .storage import write_atomic
+
 
 class ProjectService:
     """Service for managing Flutter projects."""
@@ -40,16 +43,14 @@ class ProjectService:
     def _load_projects(self):
         """Load projects from JSON file."""
         if self._projects_file.exists():
-            with open(self._projects_file, 'r') as f:
-                self._projects = json.load(f)
+            self._projects = orjson.loads(self._projects_file.read_bytes())
         else:
             self._projects = {}
             self._save_projects()
     
     def _save_projects(self):
         """Save projects to JSON file."""
-        with open(self._projects_file, 'w') as f:
-            json.dump(self._projects, f, indent=2)
+        write_atomic(self._projects_file, orjson.dumps(self._projects, option=orjson.OPT_INDENT_2))
     
     def _validate_flutter_project(self, path):
         """Validate that the path is a Flutter project."""
@@ -68,7 +69,12 @@ class ProjectService:
         return True
     
     def add(self, project_data):
-        """Add a new Flutter project."""
+        """
+        Add a new Flutter project.
+        
+        Returns:
+            Tuple of (project_id, project dict)
+        """
         name = project_data.get('name', '').strip()
         path = project_data.get('path', '').strip()
         
@@ -81,8 +87,11 @@ class ProjectService:
         # Validate Flutter project
         self._validate_flutter_project(path)
         
-        # Generate unique ID
-        project_id = str(uuid.uuid4())[:8]
+        # Generate unique 8-hex-char ID (collisions are very unlikely,
+        # but check anyway)
+        project_id = secrets.token_hex(4)
+        while project_id in self.projects:
+            project_id = secrets.token_hex(4)
         
         # Check if path already registered
         for existing in self.projects.values():
@@ -104,18 +113,21 @@ class ProjectService:
         
         # Initialize empty apps.json
         apps_file = project_data_dir / "apps" / "apps.json"
-        with open(apps_file, 'w') as f:
-            json.dump({}, f, indent=2)
+        apps_file.write_bytes(b"{}")
         
         self._projects[project_id] = project
         self._save_projects()
         
-        return project_id
+        return project_id, project
     
     def get(self, project_id):
         """Get project by ID."""
         return self.projects.get(project_id)
     
+    def exists(self, project_id):
+        """Check whether a project is registered."""
+        return project_id in self.projects
+    
     def get_all(self):
         """Get all projects."""
         return list(self.projects.values())
@@ -193,7 +205,7 @@ class ProjectService:
                 - destinationPath: Where to clone (optional, defaults to cloned/ subdirectory)
         
         Returns:
-            project_id: The ID of the newly added project
+            Tuple of (project_id, project dict) for the newly added project
         
         Raises:
             ValueError: If clone fails or result is not a valid Flutter project
@@ -344,9 +356,9 @@ class ProjectService:
         
         # Add as project (this validates it's a Flutter project)
         try:
-            project_id = self.add({'name': name, 'path': str(clone_path), 'is_cloned': True})
+            project_id, project = self.add({'name': name, 'path': str(clone_path), 'is_cloned': True})
             emit_progress('complete', 'Project added successfully!', 100, None)
-            return project_id
+            return project_id, project
         except ValueError as e:
             # Clean up cloned directory if validation fails
             if clone_path.exists():
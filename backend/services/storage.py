@@ -0,0 +1,38 @@
+"""
+File storage helpers shared by the services.
+"""
+
+import os
+import threading
+
+# Directories known to exist (see ensure_dir)
+_ensured_dirs = set()
+
+
+def ensure_dir(path):
+    """Create a directory (and parents) unless it was already ensured."""
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+def forget_dir(path):
+    """Forget that a directory was ensured, after removing it."""
+    _ensured_dirs.discard(path)
+
+
+def write_atomic(path, data):
+    """
+    Write bytes to a file via a temporary file and os.replace, so a
+    crash mid-write never leaves a truncated file behind.
+    """
+    ensure_dir(path.parent)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+    except FileNotFoundError:
+        # Directory was removed since it was ensured (e.g. project or app deleted)
+        forget_dir(path.parent)
+        ensure_dir(path.parent)
+        tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
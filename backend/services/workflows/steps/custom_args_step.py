@@ -6,6 +6,7 @@ that get appended directly to flutter build or flutter run commands.
 """
 
 import shlex
+from functools import lru_cache
 from typing import Optional
 
 from .base import WorkflowStep, StepResult, StepConfigField
@@ -81,15 +82,9 @@ class CustomArgsStep(WorkflowStep):
         if not arguments or not arguments.strip():
             return []
         
-        # First, normalize newlines to spaces
-        normalized = arguments.replace('\n', ' ').replace('\r', ' ')
-        
-        try:
-            # Use shlex to properly parse (handles quoted strings)
-            return shlex.split(normalized)
-        except ValueError:
-            # Fallback to simple split if shlex fails
-            return [arg.strip() for arg in normalized.split() if arg.strip()]
+        # Saved arguments are re-read on every build/run, so parse each
+        # distinct string once; callers get their own list to modify
+        return list(_parse_arguments(arguments))
     
     @classmethod
     def extract_arguments_from_config(cls, config: dict) -> list[str]:
@@ -105,3 +100,16 @@ class CustomArgsStep(WorkflowStep):
         arguments = config.get("arguments", "")
         return cls.parse_arguments(str(arguments) if arguments else "")
 
+
+@lru_cache(maxsize=128)
+def _parse_arguments(arguments: str) -> tuple[str, ...]:
+    """Parse a non-empty arguments string (see CustomArgsStep.parse_arguments)."""
+    # First, normalize newlines to spaces
+    normalized = arguments.replace('\n', ' ').replace('\r', ' ')
+    
+    try:
+        # Use shlex to properly parse (handles quoted strings)
+        return tuple(shlex.split(normalized))
+    except ValueError:
+        # Fallback to simple split if shlex fails
+        return tuple(arg.strip() for arg in normalized.split() if arg.strip())
@@ -13,12 +13,18 @@ def register_handlers(socketio, app):
     def handle_connect():
         """Handle client connection."""
         print(f"Client connected: {request.sid}")
+        flutter_run_service = app.extensions.get('flutter_run_service')
+        if flutter_run_service:
+            flutter_run_service.client_connected()
         emit('connected', {'status': 'connected'})
 
     @socketio.on('disconnect')
     def handle_disconnect():
         """Handle client disconnection."""
         print(f"Client disconnected: {request.sid}")
+        flutter_run_service = app.extensions.get('flutter_run_service')
+        if flutter_run_service:
+            flutter_run_service.client_disconnected()
 
     @socketio.on('join_build')
     def handle_join_build(data):
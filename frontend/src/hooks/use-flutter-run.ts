@@ -29,7 +29,7 @@ export function useFlutterRun() {
     const selectedProject = useStore((state) => state.selectedProject)
     const selectedApp = useStore((state) => state.selectedApp)
     const setFlutterRunning = useStore((state) => state.setFlutterRunning)
-    const addRunLog = useStore((state) => state.addRunLog)
+    const addRunLogs = useStore((state) => state.addRunLogs)
     const setRunError = useStore((state) => state.setRunError)
     const clearRunLogs = useStore((state) => state.clearRunLogs)
 
@@ -50,7 +50,7 @@ export function useFlutterRun() {
         setIsLoadingDevices(true)
 
         try {
-            const deviceList = await getFlutterDevices(selectedProject?.id)
+            const deviceList = await getFlutterDevices(selectedProject?.id, forceRefresh)
             setDevices(deviceList)
             setDevicesFetchedForProject(selectedProject?.id || null)
 
@@ -111,8 +111,10 @@ export function useFlutterRun() {
         setRunError(null)
 
         try {
-            // Pass app_id and run_mode to get run settings
-            await startFlutterRun(selectedDevice, selectedProject.id, selectedApp?.id, runMode)
+            // Pass app_id and run_mode to get run settings, and the device's
+            // platform so the server doesn't have to look it up
+            const devicePlatform = devices.find((d) => d.id === selectedDevice)?.platform_type
+            await startFlutterRun(selectedDevice, selectedProject.id, selectedApp?.id, runMode, devicePlatform)
             setFlutterRunning(true, selectedDevice)
         } catch (error) {
             console.error('Failed to start Flutter app:', error)
@@ -121,7 +123,7 @@ export function useFlutterRun() {
         } finally {
             setIsStarting(false)
         }
-    }, [selectedDevice, selectedProject, selectedApp, clearRunLogs, setRunError, setFlutterRunning])
+    }, [devices, selectedDevice, selectedProject, selectedApp, clearRunLogs, setRunError, setFlutterRunning])
 
     // Stop app
     const stop = useCallback(async () => {
@@ -171,8 +173,9 @@ export function useFlutterRun() {
     useEffect(() => {
         const socket = getSocket()
 
-        const handleRunLog = (data: { log_entry: LogEntry }) => {
-            addRunLog(data.log_entry)
+        // Run output arrives in batches (flushed every ~20ms server-side)
+        const handleRunLogsBatch = (data: { entries: LogEntry[] }) => {
+            addRunLogs(data.entries)
         }
 
         const handleRunStatus = (data: { status: string; device: string | null }) => {
@@ -182,14 +185,14 @@ export function useFlutterRun() {
             }
         }
 
-        socket.on('run_log', handleRunLog)
+        socket.on('run_logs_batch', handleRunLogsBatch)
         socket.on('run_status', handleRunStatus)
 
         return () => {
-            socket.off('run_log', handleRunLog)
+            socket.off('run_logs_batch', handleRunLogsBatch)
             socket.off('run_status', handleRunStatus)
         }
-    }, [addRunLog, setFlutterRunning])
+    }, [addRunLogs, setFlutterRunning])
 
     // Fetch devices when project changes (smart caching)
     useEffect(() => {
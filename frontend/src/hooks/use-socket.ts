@@ -3,17 +3,13 @@ import { getSocket, connectSocket, disconnectSocket } from '@/services/socket'
 import { useStore } from '@/store'
 import type { LogEntry } from '@/types'
 
-interface BuildLogEvent {
+interface BuildLogsBatchEvent {
   build_id: string
-  log_entry: {
-    timestamp: string
-    message: string
-    level: string
-  }
+  entries: LogEntry[]
 }
 
 export function useSocket() {
-  const { setSocketConnected, addBuildLog } = useStore()
+  const { setSocketConnected, addBuildLogs } = useStore()
 
   useEffect(() => {
     const socket = getSocket()
@@ -28,20 +24,15 @@ export function useSocket() {
       setSocketConnected(false)
     }
 
-    function handleBuildLog(data: BuildLogEvent) {
-      const logEntry: LogEntry = {
-        timestamp: data.log_entry.timestamp,
-        message: data.log_entry.message,
-        level: data.log_entry.level as LogEntry['level'],
-      }
-
-      addBuildLog(logEntry)
+    // Build output arrives in batches (flushed every ~100ms server-side)
+    function handleBuildLogsBatch(data: BuildLogsBatchEvent) {
+      addBuildLogs(data.entries)
     }
 
     // Set up event listeners
     socket.on('connect', handleConnect)
     socket.on('disconnect', handleDisconnect)
-    socket.on('build_log', handleBuildLog)
+    socket.on('build_logs_batch', handleBuildLogsBatch)
 
     // Connect socket
     connectSocket()
@@ -50,10 +41,10 @@ export function useSocket() {
     return () => {
       socket.off('connect', handleConnect)
       socket.off('disconnect', handleDisconnect)
-      socket.off('build_log', handleBuildLog)
+      socket.off('build_logs_batch', handleBuildLogsBatch)
       disconnectSocket()
     }
-  }, [setSocketConnected, addBuildLog])
+  }, [setSocketConnected, addBuildLogs])
 
   const joinBuild = useCallback((buildId: string) => {
     const socket = getSocket()
@@ -201,7 +201,8 @@ export async function buildApp(
   appId: string,
   platform: Platform,
   buildType: BuildType,
-  outputType: BuildOutputType
+  outputType: BuildOutputType,
+  forceClean = false
 ): Promise<BuildResult> {
   const response = await fetch(`${API_BASE_URL}/build/${appId}`, {
     method: 'POST',
@@ -212,6 +213,7 @@ export async function buildApp(
       platform,
       build_type: buildType,
       output_type: outputType,
+      force_clean: forceClean,
     }),
   })
 
@@ -272,9 +274,12 @@ export async function uploadAssets(
 }
 
 // Flutter Run API
-export async function getFlutterDevices(projectId?: string): Promise<FlutterDevice[]> {
-  const params = projectId ? `?project_id=${projectId}` : ''
-  const response = await fetch(`${API_BASE_URL}/flutter/devices${params}`)
+export async function getFlutterDevices(projectId?: string, refresh = false): Promise<FlutterDevice[]> {
+  const params = new URLSearchParams()
+  if (projectId) params.set('project_id', projectId)
+  if (refresh) params.set('refresh', 'true')
+  const query = params.toString()
+  const response = await fetch(`${API_BASE_URL}/flutter/devices${query ? `?${query}` : ''}`)
   return handleResponse<FlutterDevice[]>(response)
 }
 
@@ -282,7 +287,8 @@ export async function startFlutterRun(
   deviceId: string,
   projectId: string,
   appId?: string,
-  runMode: 'debug' | 'profile' | 'release' = 'debug'
+  runMode: 'debug' | 'profile' | 'release' = 'debug',
+  devicePlatform?: string | null
 ): Promise<{ status: string; device: string; project_id: string }> {
   const response = await fetch(`${API_BASE_URL}/flutter/run`, {
     method: 'POST',
@@ -294,6 +300,7 @@ export async function startFlutterRun(
       project_id: projectId,
       app_id: appId,
       run_mode: runMode,
+      device_platform: devicePlatform ?? undefined,
     }),
   })
 
@@ -47,6 +47,7 @@ interface AppState {
   startBuild: (buildId: string) => void
   restoreBuildState: (buildId: string, logs: LogEntry[]) => void
   addBuildLog: (log: LogEntry) => void
+  addBuildLogs: (logs: LogEntry[]) => void
   setBuildResult: (result: BuildResult) => void
   setBuildError: (error: string) => void
   clearBuild: () => void
@@ -56,6 +57,7 @@ interface AppState {
   // Flutter Run actions
   setFlutterRunning: (isRunning: boolean, device: string | null) => void
   addRunLog: (log: LogEntry) => void
+  addRunLogs: (logs: LogEntry[]) => void
   setRunError: (error: string | null) => void
   clearRunLogs: () => void
 
@@ -78,6 +80,15 @@ const initialBuildState: BuildState = {
   error: null,
 }
 
+// Run log entries kept in the store (the server keeps as many by default)
+const MAX_RUN_LOGS = 5000
+
+// Append entries to a run log, dropping the oldest beyond MAX_RUN_LOGS
+function appendRunLogs(logs: LogEntry[], entries: LogEntry[]): LogEntry[] {
+  const combined = logs.concat(entries)
+  return combined.length > MAX_RUN_LOGS ? combined.slice(-MAX_RUN_LOGS) : combined
+}
+
 const initialFlutterRunState: FlutterRunState = {
   isRunning: false,
   device: null,
@@ -195,6 +206,14 @@ export const useStore = create<AppState>((set) => ({
       },
     })),
 
+  addBuildLogs: (logs) =>
+    set((state) => ({
+      build: {
+        ...state.build,
+        logs: [...state.build.logs, ...logs],
+      },
+    })),
+
   setBuildResult: (result) =>
     set((state) => ({
       build: {
@@ -248,7 +267,15 @@ export const useStore = create<AppState>((set) => ({
     set((state) => ({
       flutterRun: {
         ...state.flutterRun,
-        logs: [...state.flutterRun.logs, log],
+        logs: appendRunLogs(state.flutterRun.logs, [log]),
+      },
+    })),
+
+  addRunLogs: (logs) =>
+    set((state) => ({
+      flutterRun: {
+        ...state.flutterRun,
+        logs: appendRunLogs(state.flutterRun.logs, logs),
       },
     })),
 
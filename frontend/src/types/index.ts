@@ -127,9 +127,18 @@ export interface BuildState {
   error: string | null
 }
 
+export interface RunningBuild {
+  build_id: string
+  app_id: string
+  platform: string
+  started_at: string
+}
+
 export interface BuildStatus {
   is_building: boolean
   build_id: string | null
+  build_ids: string[]
+  builds: RunningBuild[]
   logs: LogEntry[]
 }
 
@@ -138,6 +147,7 @@ export interface FlutterDevice {
   id: string
   name: string
   platform: string
+  platform_type: string | null
   isEmulator: boolean
 }
 